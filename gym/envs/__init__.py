@@ -90,44 +90,6 @@ register(
     max_episode_steps=500,
 )
 
-# Box2d
-# ----------------------------------------
-
-register(
-    id='LunarLander-v2',
-    entry_point='gym.envs.box2d:LunarLander',
-    max_episode_steps=1000,
-    reward_threshold=200,
-)
-
-register(
-    id='LunarLanderContinuous-v2',
-    entry_point='gym.envs.box2d:LunarLanderContinuous',
-    max_episode_steps=1000,
-    reward_threshold=200,
-)
-
-register(
-    id='BipedalWalker-v2',
-    entry_point='gym.envs.box2d:BipedalWalker',
-    max_episode_steps=1600,
-    reward_threshold=300,
-)
-
-register(
-    id='BipedalWalkerHardcore-v2',
-    entry_point='gym.envs.box2d:BipedalWalkerHardcore',
-    max_episode_steps=2000,
-    reward_threshold=300,
-)
-
-register(
-    id='CarRacing-v0',
-    entry_point='gym.envs.box2d:CarRacing',
-    max_episode_steps=1000,
-    reward_threshold=900,
-)
-
 # Toy Text
 # ----------------------------------------
 
@@ -198,413 +160,16 @@ register(
     max_episode_steps=200,
 )
 
-# Dart
-# ----------------------------------------
-
-
-register(
-    id='DartHopper-v1',
-    entry_point='gym.envs.dart:DartHopperEnv',
-    reward_threshold=3800.0,
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartHalfCheetah-v1',
-    entry_point='gym.envs.dart:DartHalfCheetahEnv',
-    reward_threshold=4800.0,
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartCartPole-v1',
-    entry_point='gym.envs.dart:DartCartPoleEnv',
-    reward_threshold=950.0,
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartDoubleInvertedPendulumEnv-v1',
-    entry_point='gym.envs.dart:DartDoubleInvertedPendulumEnv',
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartReacher-v1',
-    entry_point='gym.envs.dart:DartReacher2dEnv',
-    reward_threshold=-3.75,
-    max_episode_steps=50,
-)
-
-register(
-    id='DartReacher3d-v1',
-    entry_point='gym.envs.dart:DartReacherEnv',
-    reward_threshold=-200,
-    max_episode_steps=500,
-)
-
-register(
-    id='DartDog-v1',
-    entry_point='gym.envs.dart:DartDogEnv',
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartCartPoleImg-v1',
-    entry_point='gym.envs.dart:DartCartPoleImgEnv',
-    reward_threshold=950.0,
-    max_episode_steps=2000,
-)
-
-register(
-    id='DartCartPoleSwingUp-v1',
-    entry_point='gym.envs.dart:DartCartPoleSwingUpEnv',
-    max_episode_steps=500,
-)
-
-register(
-    id='DartWalker2d-v1',
-    entry_point='gym.envs.dart:DartWalker2dEnv',
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartWalker3d-v1',
-    entry_point='gym.envs.dart:DartWalker3dEnv',
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartWalker3dSPD-v1',
-    entry_point='gym.envs.dart:DartWalker3dSPDEnv',
-    max_episode_steps=1000,
-)
-
-register(
-    id='DartHumanWalker-v1',
-    entry_point='gym.envs.dart:DartHumanWalkerEnv',
-    max_episode_steps=300,
-)
-
-register(
-    id='DartSnake7Link-v1',
-    entry_point='gym.envs.dart:DartSnake7LinkEnv',
-    max_episode_steps=1000,
-)
-
-# Mujoco
-# ----------------------------------------
-
-# 2D
-register(
-    id='Reacher-v2',
-    entry_point='gym.envs.mujoco:ReacherEnv',
-    max_episode_steps=50,
-    reward_threshold=-3.75,
-)
-
-register(
-    id='Reacher3d-v1',
-    entry_point='gym.envs.mujoco:Reacher3dEnv',
-    max_episode_steps=500,
-    reward_threshold=-200,
-)
-
-register(
-    id='Pusher-v2',
-    entry_point='gym.envs.mujoco:PusherEnv',
-    max_episode_steps=100,
-    reward_threshold=0.0,
-)
-
-register(
-    id='Thrower-v2',
-    entry_point='gym.envs.mujoco:ThrowerEnv',
-    max_episode_steps=100,
-    reward_threshold=0.0,
-)
-
-register(
-    id='Striker-v2',
-    entry_point='gym.envs.mujoco:StrikerEnv',
-    max_episode_steps=100,
-    reward_threshold=0.0,
-)
-
-register(
-    id='InvertedPendulum-v2',
-    entry_point='gym.envs.mujoco:InvertedPendulumEnv',
-    max_episode_steps=1000,
-    reward_threshold=950.0,
-)
-
-register(
-    id='InvertedDoublePendulum-v2',
-    entry_point='gym.envs.mujoco:InvertedDoublePendulumEnv',
-    max_episode_steps=1000,
-    reward_threshold=9100.0,
-)
-
-register(
-    id='HalfCheetah-v2',
-    entry_point='gym.envs.mujoco:HalfCheetahEnv',
-    max_episode_steps=1000,
-    reward_threshold=4800.0,
-)
-
-register(
-    id='Hopper-v2',
-    entry_point='gym.envs.mujoco:HopperEnv',
-    max_episode_steps=1000,
-    reward_threshold=3800.0,
-)
-
-register(
-    id='Swimmer-v2',
-    entry_point='gym.envs.mujoco:SwimmerEnv',
-    max_episode_steps=1000,
-    reward_threshold=360.0,
-)
-
-register(
-    id='Walker2d-v2',
-    max_episode_steps=1000,
-    entry_point='gym.envs.mujoco:Walker2dEnv',
-)
-
-register(
-    id='Ant-v2',
-    entry_point='gym.envs.mujoco:AntEnv',
-    max_episode_steps=1000,
-    reward_threshold=6000.0,
-)
-
-register(
-    id='Humanoid-v2',
-    entry_point='gym.envs.mujoco:HumanoidEnv',
-    max_episode_steps=1000,
-)
-
-register(
-    id='HumanoidStandup-v2',
-    entry_point='gym.envs.mujoco:HumanoidStandupEnv',
-    max_episode_steps=1000,
-)
-
-# Robotics
+# Box2d, Dart, Mujoco, Robotics and Atari
 # ----------------------------------------
 
-def _merge(a, b):
-    a.update(b)
-    return a
-
-for reward_type in ['sparse', 'dense']:
-    suffix = 'Dense' if reward_type == 'dense' else ''
-    kwargs = {
-        'reward_type': reward_type,
-    }
-
-    # Fetch
-    register(
-        id='FetchSlide{}-v1'.format(suffix),
-        entry_point='gym.envs.robotics:FetchSlideEnv',
-        kwargs=kwargs,
-        max_episode_steps=50,
-    )
-
-    register(
-        id='FetchPickAndPlace{}-v1'.format(suffix),
-        entry_point='gym.envs.robotics:FetchPickAndPlaceEnv',
-        kwargs=kwargs,
-        max_episode_steps=50,
-    )
-
-    register(
-        id='FetchReach{}-v1'.format(suffix),
-        entry_point='gym.envs.robotics:FetchReachEnv',
-        kwargs=kwargs,
-        max_episode_steps=50,
-    )
-
-    register(
-        id='FetchPush{}-v1'.format(suffix),
-        entry_point='gym.envs.robotics:FetchPushEnv',
-        kwargs=kwargs,
-        max_episode_steps=50,
-    )
-
-    # Hand
-    register(
-        id='HandReach{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandReachEnv',
-        kwargs=kwargs,
-        max_episode_steps=50,
-    )
-
-    register(
-        id='HandManipulateBlockRotateZ{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandBlockEnv',
-        kwargs=_merge({'target_position': 'ignore', 'target_rotation': 'z'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulateBlockRotateParallel{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandBlockEnv',
-        kwargs=_merge({'target_position': 'ignore', 'target_rotation': 'parallel'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulateBlockRotateXYZ{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandBlockEnv',
-        kwargs=_merge({'target_position': 'ignore', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulateBlockFull{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandBlockEnv',
-        kwargs=_merge({'target_position': 'random', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    # Alias for "Full"
-    register(
-        id='HandManipulateBlock{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandBlockEnv',
-        kwargs=_merge({'target_position': 'random', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulateEggRotate{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandEggEnv',
-        kwargs=_merge({'target_position': 'ignore', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulateEggFull{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandEggEnv',
-        kwargs=_merge({'target_position': 'random', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    # Alias for "Full"
-    register(
-        id='HandManipulateEgg{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandEggEnv',
-        kwargs=_merge({'target_position': 'random', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulatePenRotate{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandPenEnv',
-        kwargs=_merge({'target_position': 'ignore', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    register(
-        id='HandManipulatePenFull{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandPenEnv',
-        kwargs=_merge({'target_position': 'random', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-    # Alias for "Full"
-    register(
-        id='HandManipulatePen{}-v0'.format(suffix),
-        entry_point='gym.envs.robotics:HandPenEnv',
-        kwargs=_merge({'target_position': 'random', 'target_rotation': 'xyz'}, kwargs),
-        max_episode_steps=100,
-    )
-
-# Atari
-# ----------------------------------------
-
-# # print ', '.join(["'{}'".format(name.split('.')[0]) for name in atari_py.list_games()])
-for game in ['air_raid', 'alien', 'amidar', 'assault', 'asterix', 'asteroids', 'atlantis',
-    'bank_heist', 'battle_zone', 'beam_rider', 'berzerk', 'bowling', 'boxing', 'breakout', 'carnival',
-    'centipede', 'chopper_command', 'crazy_climber', 'demon_attack', 'double_dunk',
-    'elevator_action', 'enduro', 'fishing_derby', 'freeway', 'frostbite', 'gopher', 'gravitar',
-    'hero', 'ice_hockey', 'jamesbond', 'journey_escape', 'kangaroo', 'krull', 'kung_fu_master',
-    'montezuma_revenge', 'ms_pacman', 'name_this_game', 'phoenix', 'pitfall', 'pong', 'pooyan',
-    'private_eye', 'qbert', 'riverraid', 'road_runner', 'robotank', 'seaquest', 'skiing',
-    'solaris', 'space_invaders', 'star_gunner', 'tennis', 'time_pilot', 'tutankham', 'up_n_down',
-    'venture', 'video_pinball', 'wizard_of_wor', 'yars_revenge', 'zaxxon']:
-    for obs_type in ['image', 'ram']:
-        # space_invaders should yield SpaceInvaders-v0 and SpaceInvaders-ram-v0
-        name = ''.join([g.capitalize() for g in game.split('_')])
-        if obs_type == 'ram':
-            name = '{}-ram'.format(name)
-
-        nondeterministic = False
-        if game == 'elevator_action' and obs_type == 'ram':
-            # ElevatorAction-ram-v0 seems to yield slightly
-            # non-deterministic observations about 10% of the time. We
-            # should track this down eventually, but for now we just
-            # mark it as nondeterministic.
-            nondeterministic = True
-
-        register(
-            id='{}-v0'.format(name),
-            entry_point='gym.envs.atari:AtariEnv',
-            kwargs={'game': game, 'obs_type': obs_type, 'repeat_action_probability': 0.25},
-            max_episode_steps=10000,
-            nondeterministic=nondeterministic,
-        )
-
-        register(
-            id='{}-v4'.format(name),
-            entry_point='gym.envs.atari:AtariEnv',
-            kwargs={'game': game, 'obs_type': obs_type},
-            max_episode_steps=100000,
-            nondeterministic=nondeterministic,
-        )
-
-        # Standard Deterministic (as in the original DeepMind paper)
-        if game == 'space_invaders':
-            frameskip = 3
-        else:
-            frameskip = 4
-
-        # Use a deterministic frame skip.
-        register(
-            id='{}Deterministic-v0'.format(name),
-            entry_point='gym.envs.atari:AtariEnv',
-            kwargs={'game': game, 'obs_type': obs_type, 'frameskip': frameskip, 'repeat_action_probability': 0.25},
-            max_episode_steps=100000,
-            nondeterministic=nondeterministic,
-        )
-
-        register(
-            id='{}Deterministic-v4'.format(name),
-            entry_point='gym.envs.atari:AtariEnv',
-            kwargs={'game': game, 'obs_type': obs_type, 'frameskip': frameskip},
-            max_episode_steps=100000,
-            nondeterministic=nondeterministic,
-        )
-
-        register(
-            id='{}NoFrameskip-v0'.format(name),
-            entry_point='gym.envs.atari:AtariEnv',
-            kwargs={'game': game, 'obs_type': obs_type, 'frameskip': 1, 'repeat_action_probability': 0.25}, # A frameskip of 1 means we get every frame
-            max_episode_steps=frameskip * 100000,
-            nondeterministic=nondeterministic,
-        )
-
-        # No frameskip. (Atari has no entropy source, so these are
-        # deterministic environments.)
-        register(
-            id='{}NoFrameskip-v4'.format(name),
-            entry_point='gym.envs.atari:AtariEnv',
-            kwargs={'game': game, 'obs_type': obs_type, 'frameskip': 1}, # A frameskip of 1 means we get every frame
-            max_episode_steps=frameskip * 100000,
-            nondeterministic=nondeterministic,
-        )
-
+# registered on the first lookup of an id that is not registered yet, see
+# EnvRegistry.register_family
+registry.register_family('box2d', 'gym.envs.families.box2d')
+registry.register_family('dart', 'gym.envs.families.dart')
+registry.register_family('mujoco', 'gym.envs.families.mujoco')
+registry.register_family('robotics', 'gym.envs.families.robotics')
+registry.register_family('atari', 'gym.envs.families.atari')
 
 # Unit test
 # ---------
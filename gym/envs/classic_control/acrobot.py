@@ -1,8 +1,10 @@
 """classic Acrobot task"""
-from gym import core, spaces
-from gym.utils import seeding
+import math
 import numpy as np
 from numpy import sin, cos, pi
+from gym import core, spaces
+from gym.utils import seeding
+from gym.envs.classic_control.integrators import rk4_step
 
 __copyright__ = "Copyright 2013, RLPy http://acl.mit.edu/RLPy"
 __credits__ = ["Alborz Geramifard", "Robert H. Klein", "Christoph Dann",
@@ -100,21 +102,16 @@ class AcrobotEnv(core.Env):
         return self._get_ob()
 
     def step(self, a):
-        s = self.state
+        s = np.asarray(self.state).tolist()
         torque = self.AVAIL_TORQUE[a]
 
         # Add noise to the force action
         if self.torque_noise_max > 0:
             torque += self.np_random.uniform(-self.torque_noise_max, self.torque_noise_max)
 
-        # Now, augment the state with our force action so it can be passed to
-        # _dsdt
-        s_augmented = np.append(s, torque)
-
-        ns = rk4(self._dsdt, s_augmented, [0, self.dt])
-        # only care about final timestep of integration returned by integrator
-        ns = ns[-1]
-        ns = ns[:4]  # omit action
+        # a single fixed-step RK4 update on plain floats; the torque is passed
+        # to the derivative instead of being appended to the state
+        ns = rk4_step(self._dsdt_scalar, s, self.dt, args=(float(torque),))
         # ODEINT IS TOO SLOW!
         # ns_continuous = integrate.odeint(self._dsdt, self.s_continuous, [0, self.dt])
         # self.s_continuous = ns_continuous[-1] # We only care about the state
@@ -124,20 +121,42 @@ class AcrobotEnv(core.Env):
         ns[1] = wrap(ns[1], -pi, pi)
         ns[2] = bound(ns[2], -self.MAX_VEL_1, self.MAX_VEL_1)
         ns[3] = bound(ns[3], -self.MAX_VEL_2, self.MAX_VEL_2)
-        self.state = ns
+        self.state = np.array(ns)
         terminal = self._terminal()
         reward = -1. if not terminal else 0.
         return (self._get_ob(), reward, terminal, {})
 
     def _get_ob(self):
-        s = self.state
-        return np.array([cos(s[0]), np.sin(s[0]), cos(s[1]), sin(s[1]), s[2], s[3]])
+        s = np.asarray(self.state).tolist()
+        return np.array([math.cos(s[0]), math.sin(s[0]), math.cos(s[1]), math.sin(s[1]), s[2], s[3]])
 
     def _terminal(self):
-        s = self.state
-        return bool(-np.cos(s[0]) - np.cos(s[1] + s[0]) > 1.)
+        s = np.asarray(self.state).tolist()
+        return bool(-math.cos(s[0]) - math.cos(s[1] + s[0]) > 1.)
 
     def _dsdt(self, s_augmented, t):
+        return self._dsdt_scalar(tuple(s_augmented[:-1]), s_augmented[-1]) + (0.,)
+
+    def _dsdt_scalar(self, s, a):
+        """Time derivative of a single state given as a sequence of floats,
+        computed with the `math` module (NumPy is much slower on scalars).
+        """
+        theta1, theta2, dtheta1, dtheta2 = s
+        ddtheta1, ddtheta2 = self._accelerations(theta1, theta2, dtheta1, dtheta2, a, math.cos, math.sin)
+        return (dtheta1, dtheta2, ddtheta1, ddtheta2)
+
+    def _dsdt_array(self, s, out, a):
+        """Writes the time derivative of the states `s`, of shape (..., 4),
+        under the torques `a` into `out`.
+        """
+        ddtheta1, ddtheta2 = self._accelerations(s[..., 0], s[..., 1], s[..., 2], s[..., 3], a, np.cos, np.sin)
+        out[..., 0] = s[..., 2]
+        out[..., 1] = s[..., 3]
+        out[..., 2] = ddtheta1
+        out[..., 3] = ddtheta2
+        return out
+
+    def _accelerations(self, theta1, theta2, dtheta1, dtheta2, a, cos, sin):
         m1 = self.LINK_MASS_1
         m2 = self.LINK_MASS_2
         l1 = self.LINK_LENGTH_1
@@ -146,19 +165,13 @@ class AcrobotEnv(core.Env):
         I1 = self.LINK_MOI
         I2 = self.LINK_MOI
         g = 9.8
-        a = s_augmented[-1]
-        s = s_augmented[:-1]
-        theta1 = s[0]
-        theta2 = s[1]
-        dtheta1 = s[2]
-        dtheta2 = s[3]
         d1 = m1 * lc1 ** 2 + m2 * \
-            (l1 ** 2 + lc2 ** 2 + 2 * l1 * lc2 * np.cos(theta2)) + I1 + I2
-        d2 = m2 * (lc2 ** 2 + l1 * lc2 * np.cos(theta2)) + I2
-        phi2 = m2 * lc2 * g * np.cos(theta1 + theta2 - np.pi / 2.)
-        phi1 = - m2 * l1 * lc2 * dtheta2 ** 2 * np.sin(theta2) \
-               - 2 * m2 * l1 * lc2 * dtheta2 * dtheta1 * np.sin(theta2)  \
-            + (m1 * lc1 + m2 * l1) * g * np.cos(theta1 - np.pi / 2) + phi2
+            (l1 ** 2 + lc2 ** 2 + 2 * l1 * lc2 * cos(theta2)) + I1 + I2
+        d2 = m2 * (lc2 ** 2 + l1 * lc2 * cos(theta2)) + I2
+        phi2 = m2 * lc2 * g * cos(theta1 + theta2 - np.pi / 2.)
+        phi1 = - m2 * l1 * lc2 * dtheta2 ** 2 * sin(theta2) \
+               - 2 * m2 * l1 * lc2 * dtheta2 * dtheta1 * sin(theta2)  \
+            + (m1 * lc1 + m2 * l1) * g * cos(theta1 - np.pi / 2) + phi2
         if self.book_or_nips == "nips":
             # the following line is consistent with the description in the
             # paper
@@ -167,10 +180,10 @@ class AcrobotEnv(core.Env):
         else:
             # the following line is consistent with the java implementation and the
             # book
-            ddtheta2 = (a + d2 / d1 * phi1 - m2 * l1 * lc2 * dtheta1 ** 2 * np.sin(theta2) - phi2) \
+            ddtheta2 = (a + d2 / d1 * phi1 - m2 * l1 * lc2 * dtheta1 ** 2 * sin(theta2) - phi2) \
                 / (m2 * lc2 ** 2 + I2 - d2 ** 2 / d1)
         ddtheta1 = -(d2 * ddtheta2 + phi1) / d1
-        return (dtheta1, dtheta2, ddtheta1, ddtheta2, 0.)
+        return ddtheta1, ddtheta2
 
     def render(self, mode='human'):
         from gym.envs.classic_control import rendering
@@ -236,65 +249,3 @@ def bound(x, m, M=None):
     # bound x between min (m) and Max (M)
     return min(max(x, m), M)
 
-
-def rk4(derivs, y0, t, *args, **kwargs):
-    """
-    Integrate 1D or ND system of ODEs using 4-th order Runge-Kutta.
-    This is a toy implementation which may be useful if you find
-    yourself stranded on a system w/o scipy.  Otherwise use
-    :func:`scipy.integrate`.
-    *y0*
-        initial state vector
-    *t*
-        sample times
-    *derivs*
-        returns the derivative of the system and has the
-        signature ``dy = derivs(yi, ti)``
-    *args*
-        additional arguments passed to the derivative function
-    *kwargs*
-        additional keyword arguments passed to the derivative function
-    Example 1 ::
-        ## 2D system
-        def derivs6(x,t):
-            d1 =  x[0] + 2*x[1]
-            d2 =  -3*x[0] + 4*x[1]
-            return (d1, d2)
-        dt = 0.0005
-        t = arange(0.0, 2.0, dt)
-        y0 = (1,2)
-        yout = rk4(derivs6, y0, t)
-    Example 2::
-        ## 1D system
-        alpha = 2
-        def derivs(x,t):
-            return -alpha*x + exp(-t)
-        y0 = 1
-        yout = rk4(derivs, y0, t)
-    If you have access to scipy, you should probably be using the
-    scipy.integrate tools rather than this function.
-    """
-
-    try:
-        Ny = len(y0)
-    except TypeError:
-        yout = np.zeros((len(t),), np.float_)
-    else:
-        yout = np.zeros((len(t), Ny), np.float_)
-
-    yout[0] = y0
-
-
-    for i in np.arange(len(t) - 1):
-
-        thist = t[i]
-        dt = t[i + 1] - thist
-        dt2 = dt / 2.0
-        y0 = yout[i]
-
-        k1 = np.asarray(derivs(y0, thist, *args, **kwargs))
-        k2 = np.asarray(derivs(y0 + dt2 * k1, thist + dt2, *args, **kwargs))
-        k3 = np.asarray(derivs(y0 + dt2 * k2, thist + dt2, *args, **kwargs))
-        k4 = np.asarray(derivs(y0 + dt * k3, thist + dt, *args, **kwargs))
-        yout[i + 1] = y0 + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
-    return yout
@@ -0,0 +1,255 @@
+"""
+Batched versions of the classic control tasks.
+
+Each env holds the state of `num_envs` independent instances in a
+(num_envs, state_dim) array and advances all of them with one vectorized
+NumPy step. The dynamics, rewards and termination rules are the same as in
+the single-instance envs; finished instances are reset automatically.
+"""
+
+import numpy as np
+from numpy import pi
+
+from gym.utils import seeding
+from gym.vector import VectorEnv
+from gym.envs.classic_control.cartpole import CartPoleEnv
+from gym.envs.classic_control.pendulum import PendulumEnv, angle_normalize
+from gym.envs.classic_control.mountain_car import MountainCarEnv
+from gym.envs.classic_control.continuous_mountain_car import Continuous_MountainCarEnv
+from gym.envs.classic_control.acrobot import AcrobotEnv
+from gym.envs.classic_control.integrators import RK4
+
+
+class BatchedEnv(VectorEnv):
+    """Base class of the batched classic control envs.
+
+    Subclasses implement `_sample_states(n)`, `_get_obs(index)` and
+    `_step(actions) -> (rewards, dones)`, which advances `self.state`. They
+    also inherit from the single-instance env, whose constructor (called
+    after this one) sets the physical parameters and the spaces.
+
+    Unlike SubprocVecEnv, all instances share one random number generator:
+    `seed(s)` seeds the whole batch and returns `[s]`.
+
+    Args:
+        num_envs (int): number of instances.
+        max_episode_steps (Optional[int]): if given, an instance is done (and
+          reset) after this many steps, like the TimeLimit wrapper.
+    """
+
+    def __init__(self, num_envs, observation_space, action_space, max_episode_steps=None):
+        VectorEnv.__init__(self, num_envs, observation_space, action_space)
+        self.max_episode_steps = max_episode_steps
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self.state = None
+        self.seed()
+
+    def seed(self, seed=None):
+        self.np_random, seed = seeding.np_random(seed)
+        return [seed]
+
+    def reset(self):
+        self.state = self._sample_states(self.num_envs)
+        self.elapsed_steps[:] = 0
+        return self._get_obs()
+
+    def reset_where(self, mask):
+        """Resets the instances selected by the boolean array `mask` and
+        returns their new observations.
+        """
+        self.state[mask] = self._sample_states(int(np.count_nonzero(mask)))
+        self.elapsed_steps[mask] = 0
+        return self._get_obs(mask)
+
+    def step(self, actions):
+        assert self.state is not None, "Cannot call step() before calling reset()"
+        actions = np.asarray(actions)
+        assert len(actions) == self.num_envs, "Expected {} actions, got {}".format(self.num_envs, len(actions))
+        rewards, dones = self._step(actions)
+        observations = self._get_obs()
+
+        self.elapsed_steps += 1
+        if self.max_episode_steps is not None:
+            dones |= self.elapsed_steps >= self.max_episode_steps
+
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = observations[i].copy()
+            observations[dones] = self.reset_where(dones)
+        return observations, rewards, dones, infos
+
+    def _sample_states(self, n):
+        raise NotImplementedError
+
+    def _get_obs(self, index=slice(None)):
+        raise NotImplementedError
+
+    def _step(self, actions):
+        raise NotImplementedError
+
+
+class BatchedCartPoleEnv(BatchedEnv, CartPoleEnv):
+    """Batched CartPoleEnv. Actions are an int array of shape (num_envs,)."""
+
+    def __init__(self, num_envs, max_episode_steps=None):
+        BatchedEnv.__init__(self, num_envs, None, None, max_episode_steps)
+        CartPoleEnv.__init__(self)
+
+    def _sample_states(self, n):
+        return self.np_random.uniform(low=-0.05, high=0.05, size=(n, 4))
+
+    def _get_obs(self, index=slice(None)):
+        return self.state[index].copy()
+
+    def _step(self, actions):
+        x, x_dot, theta, theta_dot = self.state.T
+        force = np.where(actions == 1, self.force_mag, -self.force_mag)
+        costheta = np.cos(theta)
+        sintheta = np.sin(theta)
+        temp = (force + self.polemass_length * theta_dot * theta_dot * sintheta) / self.total_mass
+        thetaacc = (self.gravity * sintheta - costheta * temp) / (self.length * (4.0/3.0 - self.masspole * costheta * costheta / self.total_mass))
+        xacc = temp - self.polemass_length * thetaacc * costheta / self.total_mass
+        x = x + self.tau * x_dot
+        x_dot = x_dot + self.tau * xacc
+        theta = theta + self.tau * theta_dot
+        theta_dot = theta_dot + self.tau * thetaacc
+        self.state = np.stack([x, x_dot, theta, theta_dot], axis=1)
+        dones = (x < -self.x_threshold) | (x > self.x_threshold) \
+            | (theta < -self.theta_threshold_radians) | (theta > self.theta_threshold_radians)
+        return np.ones(self.num_envs), dones
+
+
+class BatchedPendulumEnv(BatchedEnv, PendulumEnv):
+    """Batched PendulumEnv. Actions are a float array of shape (num_envs, 1)."""
+
+    def __init__(self, num_envs, max_episode_steps=None):
+        BatchedEnv.__init__(self, num_envs, None, None, max_episode_steps)
+        PendulumEnv.__init__(self)
+
+    def _sample_states(self, n):
+        high = np.array([np.pi, 1])
+        return self.np_random.uniform(low=-high, high=high, size=(n, 2))
+
+    def _get_obs(self, index=slice(None)):
+        theta, thetadot = self.state[index].T
+        return np.stack([np.cos(theta), np.sin(theta), thetadot], axis=1)
+
+    def _step(self, actions):
+        th, thdot = self.state.T
+        g = 10.
+        m = 1.
+        l = 1.
+        dt = self.dt
+
+        u = np.clip(actions.reshape(self.num_envs, -1)[:, 0], -self.max_torque, self.max_torque)
+        costs = angle_normalize(th)**2 + .1*thdot**2 + .001*(u**2)
+
+        newthdot = thdot + (-3*g/(2*l) * np.sin(th + np.pi) + 3./(m*l**2)*u) * dt
+        newth = th + newthdot*dt
+        newthdot = np.clip(newthdot, -self.max_speed, self.max_speed)
+
+        self.state = np.stack([newth, newthdot], axis=1)
+        return -costs, np.zeros(self.num_envs, dtype=bool)
+
+
+class BatchedMountainCarEnv(BatchedEnv, MountainCarEnv):
+    """Batched MountainCarEnv. Actions are an int array of shape (num_envs,)."""
+
+    def __init__(self, num_envs, max_episode_steps=None):
+        BatchedEnv.__init__(self, num_envs, None, None, max_episode_steps)
+        MountainCarEnv.__init__(self)
+
+    def _sample_states(self, n):
+        states = np.zeros((n, 2))
+        states[:, 0] = self.np_random.uniform(low=-0.6, high=-0.4, size=n)
+        return states
+
+    def _get_obs(self, index=slice(None)):
+        return self.state[index].copy()
+
+    def _step(self, actions):
+        position, velocity = self.state.T
+        velocity = velocity + (actions-1)*0.001 + np.cos(3*position)*(-0.0025)
+        velocity = np.clip(velocity, -self.max_speed, self.max_speed)
+        position = np.clip(position + velocity, self.min_position, self.max_position)
+        velocity[(position == self.min_position) & (velocity < 0)] = 0
+
+        self.state = np.stack([position, velocity], axis=1)
+        return -np.ones(self.num_envs), position >= self.goal_position
+
+
+class BatchedContinuous_MountainCarEnv(BatchedEnv, Continuous_MountainCarEnv):
+    """Batched Continuous_MountainCarEnv. Actions are a float array of shape
+    (num_envs, 1).
+    """
+
+    def __init__(self, num_envs, max_episode_steps=None):
+        BatchedEnv.__init__(self, num_envs, None, None, max_episode_steps)
+        Continuous_MountainCarEnv.__init__(self)
+
+    def _sample_states(self, n):
+        states = np.zeros((n, 2))
+        states[:, 0] = self.np_random.uniform(low=-0.6, high=-0.4, size=n)
+        return states
+
+    def _get_obs(self, index=slice(None)):
+        return self.state[index].copy()
+
+    def _step(self, actions):
+        action = actions.reshape(self.num_envs, -1)[:, 0]
+        position, velocity = self.state.T
+        force = np.clip(action, -1.0, 1.0)
+
+        velocity = velocity + force*self.power - 0.0025 * np.cos(3*position)
+        velocity = np.clip(velocity, -self.max_speed, self.max_speed)
+        position = np.clip(position + velocity, self.min_position, self.max_position)
+        velocity[(position == self.min_position) & (velocity < 0)] = 0
+
+        dones = position >= self.goal_position
+        rewards = np.where(dones, 100.0, 0.0) - action**2 * 0.1
+
+        self.state = np.stack([position, velocity], axis=1)
+        return rewards, dones
+
+
+class BatchedAcrobotEnv(BatchedEnv, AcrobotEnv):
+    """Batched AcrobotEnv. Actions are an int array of shape (num_envs,)."""
+
+    def __init__(self, num_envs, max_episode_steps=None):
+        BatchedEnv.__init__(self, num_envs, None, None, max_episode_steps)
+        AcrobotEnv.__init__(self)
+        self._torques = np.array(self.AVAIL_TORQUE)
+        self._integrator = RK4(self._dsdt_array)
+
+    def _sample_states(self, n):
+        return self.np_random.uniform(low=-0.1, high=0.1, size=(n, 4))
+
+    def _get_obs(self, index=slice(None)):
+        s = self.state[index]
+        return np.stack([np.cos(s[:, 0]), np.sin(s[:, 0]), np.cos(s[:, 1]), np.sin(s[:, 1]), s[:, 2], s[:, 3]], axis=1)
+
+    def _step(self, actions):
+        torque = self._torques[actions]
+        if self.torque_noise_max > 0:
+            torque = torque + self.np_random.uniform(-self.torque_noise_max, self.torque_noise_max, size=self.num_envs)
+
+        # a single fixed-step RK4 update of the whole batch, with the
+        # derivative of AcrobotEnv
+        ns = self._integrator.step(self.state, self.dt, args=(torque,))
+        ns[:, 0] = wrap_batch(ns[:, 0], -pi, pi)
+        ns[:, 1] = wrap_batch(ns[:, 1], -pi, pi)
+        ns[:, 2] = np.clip(ns[:, 2], -self.MAX_VEL_1, self.MAX_VEL_1)
+        ns[:, 3] = np.clip(ns[:, 3], -self.MAX_VEL_2, self.MAX_VEL_2)
+        self.state = ns
+        terminal = -np.cos(ns[:, 0]) - np.cos(ns[:, 1] + ns[:, 0]) > 1.
+        return np.where(terminal, 0., -1.), terminal
+
+
+def wrap_batch(x, m, M):
+    """Array version of acrobot.wrap: shifts every entry of `x` by whole
+    periods (M - m) until it lies in [m, M].
+    """
+    diff = M - m
+    x = np.where(x > M, x - diff * np.ceil((x - M) / diff), x)
+    return np.where(x < m, x + diff * np.ceil((m - x) / diff), x)
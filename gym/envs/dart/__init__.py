@@ -1,3 +1,8 @@
+from gym.envs.dart import gui
+gui.defer()
+# ^^^^^ before pydart2 is imported, so that its GL/GLUT GUI is only
+# loaded when a viewer is created
+
 from gym.envs.dart.dart_env import DartEnv
 # ^^^^^ so that user gets the correct error
 # message if pydart is not installed correctly
@@ -18,4 +23,10 @@ from gym.envs.dart.human_walker import DartHumanWalkerEnv
 
 from gym.envs.dart.snake_7link import DartSnake7LinkEnv
 
-from gym.envs.dart.half_cheetah import DartHalfCheetahEnv
\ No newline at end of file
+from gym.envs.dart.half_cheetah import DartHalfCheetahEnv
+from gym.envs.dart.vec_env import DartVecEnv
+from gym.envs.dart.linearize import Linearizer, Linearization
+from gym.envs.dart.randomization import DomainRandomizer
+from gym.envs.dart.perturbation import PushPerturbation
+from gym.envs.dart.collision import CollisionConfig
+from gym.envs.dart.batched import BatchedDartHopperEnv, BatchedDartWalker2dEnv
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class Actuator(object):
+    """Maps a normalized action to the generalized force vector of a skeleton.
+
+    The action is clipped to the control bounds, multiplied by the per-dof
+    action scale and scattered into the actuated dofs of a torque buffer that
+    is allocated once and reused on every call, so `torques` does a single
+    NumPy pass per step instead of a Python loop and a fresh `np.zeros`.
+
+    Args:
+        control_bounds: (2, act_dim) array, upper bounds first then lower
+          bounds (the `action_bounds` layout used by DartEnv).
+        action_scale (float or array): torque per unit of action.
+        ndofs (int): number of dofs of the actuated skeleton.
+        actuated_dofs (Optional[slice]): dofs driven by the action; defaults
+          to the last `act_dim` dofs, i.e. everything below a floating or
+          planar root joint.
+    """
+
+    def __init__(self, control_bounds, action_scale, ndofs, actuated_dofs=None):
+        self.upper = np.array(control_bounds[0], dtype=np.float64)
+        self.lower = np.array(control_bounds[1], dtype=np.float64)
+        act_dim = len(self.upper)
+        self.scale = np.ones(act_dim) * action_scale
+        if actuated_dofs is None:
+            actuated_dofs = slice(ndofs - act_dim, ndofs)
+        self.dofs = actuated_dofs
+
+        self.clamped = np.zeros(act_dim)
+        self.tau = np.zeros(ndofs)
+        self._actuated_tau = self.tau[self.dofs]
+        assert self._actuated_tau.shape == (act_dim,), 'actuated dofs do not match the action dimension'
+
+    def clip(self, a):
+        """Clips `a` to the control bounds. The result is written to, and
+        returned as, `self.clamped`.
+        """
+        return np.clip(a, self.lower, self.upper, out=self.clamped)
+
+    def torques(self, a):
+        """Returns the torque vector for action `a`. The returned array is
+        reused by the next call; copy it if you need to keep it.
+        """
+        np.multiply(self.clip(a), self.scale, out=self._actuated_tau)
+        return self.tau
+
+    def batch_torques(self, actions, out):
+        """Writes the torque vectors of a (n, act_dim) batch of actions into
+        the rows of `out`, a (n, ndofs) array, and returns it.
+        """
+        clamped = np.clip(actions, self.lower, self.upper)
+        out[:, self.dofs] = clamped * self.scale
+        return out
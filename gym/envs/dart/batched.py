@@ -0,0 +1,206 @@
+"""
+Batched versions of the planar DART locomotion envs.
+
+Each env holds `num_envs` copies of the robot in one DartWorld (see
+replicate.replicate_skel) and advances all of them with a single
+World.step per substep, so the per-step Python and constraint-solver
+setup is paid once for the whole batch instead of once per robot. The
+copies move in parallel lanes and never touch each other. Rewards and
+termination rules are those of the single-robot envs; finished copies are
+reset on their own, leaving the others where they are.
+"""
+
+import numpy as np
+
+from gym import utils
+from gym.utils import seeding
+from gym.vector import VectorEnv
+from gym.envs.dart.collision import CollisionConfig
+from gym.envs.dart.hopper import DartHopperEnv
+from gym.envs.dart.snapshot import SkeletonSnapshot
+from gym.envs.dart.walker2d import DartWalker2dEnv
+from gym.envs.dart.world_builder import get_world_builder
+
+
+class BatchedDartEnv(VectorEnv):
+    """Base class of the batched DART envs.
+
+    Subclasses also inherit from the single-robot env, whose constructor
+    (called after this one) loads the world through `_build_world`, here
+    with `num_envs` copies of the robot, and sets the spaces. They then
+    call `_init_copies` and implement `_sample_states(indices)`,
+    `_get_obs(index)` and `_step(actions, x_before) -> (rewards, dones)`,
+    reading the state of the copies from `self.x` and `self.coms`.
+
+    As in the batched classic control envs, all copies share one random
+    number generator. Pushes, fluid drag and dynamics randomization are not
+    applied to the copies.
+
+    Args:
+        num_envs (int): number of robot copies.
+        lane_width (float): distance between neighbouring copies along the
+          z axis, across the plane they move in.
+        max_episode_steps (Optional[int]): if given, a copy is done (and
+          reset) after this many steps, like the TimeLimit wrapper.
+    """
+
+    def __init__(self, num_envs, lane_width=1.0, max_episode_steps=None):
+        VectorEnv.__init__(self, num_envs, None, None)
+        self.lane_width = lane_width
+        self.max_episode_steps = max_episode_steps
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self.robots = None
+
+    def _build_world(self, model_paths, dt):
+        world = get_world_builder(model_paths, dt, self.num_envs, self.lane_width).build_world(self.record_world)
+        self.robots = world.skeletons[-self.num_envs:]
+        return world
+
+    def _init_copies(self, bodynodes=()):
+        """Creates a SkeletonSnapshot of every copy, tracking `bodynodes`,
+        and the arrays their states are gathered into. Called at the end of
+        the subclass constructor."""
+        ndofs = self.robot_skeleton.ndofs
+        self.snapshots = [SkeletonSnapshot(robot, bodynodes) for robot in self.robots]
+        self.x = np.zeros((self.num_envs, 2 * ndofs))
+        self.coms = np.zeros((self.num_envs, len(bodynodes), 3))
+        self.taus = np.zeros((self.num_envs, ndofs))
+        self._update_copies()
+        # the pose of the model file, which resets start from
+        self.init_x = self.x.copy()
+
+    def seed(self, seed=None):
+        self.np_random, seed = seeding.np_random(seed)
+        return [seed]
+
+    def configure_collision(self, config=None, **kwargs):
+        if config is None:
+            config = CollisionConfig(**kwargs)
+        self.collision_config = config
+        return config.apply(self.dart_world, *self.robots)
+
+    def _update_copies(self):
+        for k, snap in enumerate(self.snapshots):
+            snap.update()
+            self.x[k] = snap.x
+            self.coms[k] = snap.coms
+
+    def _set_copies(self, indices, states):
+        ndofs = self.robot_skeleton.ndofs
+        for k, x in zip(indices, states):
+            self.robots[k].set_positions(x[:ndofs])
+            self.robots[k].set_velocities(x[ndofs:])
+        self._update_copies()
+
+    def reset(self):
+        self.dart_world.reset()
+        indices = np.arange(self.num_envs)
+        self._set_copies(indices, self._sample_states(indices))
+        self.elapsed_steps[:] = 0
+        return self._get_obs()
+
+    def reset_where(self, mask):
+        """Resets the copies selected by the boolean array `mask` and returns
+        their new observations. The other copies, and the world's time, are
+        left as they are.
+        """
+        indices = np.flatnonzero(mask)
+        self._set_copies(indices, self._sample_states(indices))
+        self.elapsed_steps[mask] = 0
+        return self._get_obs(mask)
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        assert len(actions) == self.num_envs, "Expected {} actions, got {}".format(self.num_envs, len(actions))
+        x_before = self.x.copy()
+        self.actuator.batch_torques(actions, self.taus)
+        self.dart_world.step_with_batch_forces(self.robots, self.taus, self.frame_skip)
+        self._update_copies()
+        rewards, dones = self._step(actions, x_before)
+        observations = self._get_obs()
+
+        self.elapsed_steps += 1
+        if self.max_episode_steps is not None:
+            dones |= self.elapsed_steps >= self.max_episode_steps
+
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = observations[i].copy()
+            observations[dones] = self.reset_where(dones)
+        return observations, rewards, dones, infos
+
+    def _sample_states(self, indices):
+        raise NotImplementedError
+
+    def _get_obs(self, index=slice(None)):
+        raise NotImplementedError
+
+    def _step(self, actions, x_before):
+        raise NotImplementedError
+
+
+class BatchedDartHopperEnv(BatchedDartEnv, DartHopperEnv):
+    """Batched DartHopperEnv. Actions are a float array of shape (num_envs, 3)."""
+
+    def __init__(self, num_envs, lane_width=1.0, max_episode_steps=None, disableViewer=False, render_backend='glut'):
+        BatchedDartEnv.__init__(self, num_envs, lane_width, max_episode_steps)
+        DartHopperEnv.__init__(self, disableViewer, render_backend)
+        self._init_copies([2])
+        utils.EzPickle.__init__(self, num_envs, lane_width, max_episode_steps, disableViewer, render_backend)
+
+    def _sample_states(self, indices):
+        return self.init_x[indices] + self.np_random.uniform(low=-.005, high=.005, size=(len(indices), self.x.shape[1]))
+
+    def _get_obs(self, index=slice(None)):
+        ndofs = self.robot_skeleton.ndofs
+        x = self.x[index]
+        return np.concatenate([self.coms[index, 0, 1:2], x[:, 2:ndofs], np.clip(x[:, ndofs:], -10, 10)], axis=1)
+
+    def _step(self, actions, x_before):
+        posbefore = x_before[:, 0]
+        posafter, ang = self.x[:, 0], self.x[:, 2]
+        height = self.coms[:, 0, 1]
+
+        alive_bonus = 1.0
+        rewards = (posafter - posbefore) / self.dt
+        rewards += alive_bonus
+        rewards -= 1e-3 * np.square(actions).sum(axis=1)
+
+        s = self.x
+        dones = ~(np.isfinite(s).all(axis=1) & (np.abs(s[:, 2:]) < 100).all(axis=1) &
+                  (height > .7) & (height < 1.8) & (np.abs(ang) < .2))
+        return rewards, dones
+
+
+class BatchedDartWalker2dEnv(BatchedDartEnv, DartWalker2dEnv):
+    """Batched DartWalker2dEnv. Actions are a float array of shape (num_envs, 6)."""
+
+    def __init__(self, num_envs, lane_width=1.0, max_episode_steps=None, disableViewer=False, render_backend='glut'):
+        BatchedDartEnv.__init__(self, num_envs, lane_width, max_episode_steps)
+        DartWalker2dEnv.__init__(self, disableViewer, render_backend)
+        self._init_copies([2])
+        utils.EzPickle.__init__(self, num_envs, lane_width, max_episode_steps, disableViewer, render_backend)
+
+    def _sample_states(self, indices):
+        return self.init_x[indices] + self.np_random.uniform(low=-.005, high=.005, size=(len(indices), self.x.shape[1]))
+
+    def _get_obs(self, index=slice(None)):
+        ndofs = self.robot_skeleton.ndofs
+        x = self.x[index]
+        return np.concatenate([self.coms[index, 0, 1:2], x[:, 2:ndofs], np.clip(x[:, ndofs:], -10, 10)], axis=1)
+
+    def _step(self, actions, x_before):
+        posbefore = x_before[:, 0]
+        posafter, ang = self.x[:, 0], self.x[:, 2]
+        height = self.coms[:, 0, 1]
+
+        alive_bonus = 1.0
+        rewards = (posafter - posbefore) / self.dt
+        rewards += alive_bonus
+        rewards -= 1e-3 * np.square(actions).sum(axis=1)
+
+        s = self.x
+        dones = ~(np.isfinite(s).all(axis=1) & (np.abs(s[:, 2:]) < 100).all(axis=1) &
+                  (height > .8) & (height < 2.0) & (np.abs(ang) < 1.0))
+        return rewards, dones
@@ -3,11 +3,11 @@ from gym import utils
 from gym.envs.dart import dart_env
 
 class DartCartPoleEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    def __init__(self, disableViewer=False, render_backend='glut'):
         control_bounds = np.array([[1.0],[-1.0]])
         self.action_scale = 100
-        dart_env.DartEnv.__init__(self, 'cartpole.skel', 2, 4, control_bounds, dt=0.02, disableViewer=False)
-        utils.EzPickle.__init__(self)
+        dart_env.DartEnv.__init__(self, 'cartpole.skel', 2, 4, control_bounds, dt=0.02, disableViewer=disableViewer, render_backend=render_backend)
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def step(self, a):
         reward = 1.0
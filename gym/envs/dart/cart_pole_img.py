@@ -6,7 +6,9 @@ from gym import spaces
 from gym.envs.dart import dart_env
 
 class DartCartPoleImgEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('cart_pos_x', 'pole_rotate', 'cart_pos_x_old', 'pole_rotate_old', 'cart_spd', 'pole_spd')
+
+    def __init__(self, render_backend='glut'):
         self.x_threshold = 1.4
         self.pole_theta_threshold = 0.268
         self.cart_pos_x = 0.0
@@ -22,8 +24,9 @@ class DartCartPoleImgEnv(dart_env.DartEnv, utils.EzPickle):
         self.action_space = spaces.Discrete(2)
         dart_env.DartEnv.__init__(self, 'cartpole.skel', 2, 4, control_bounds, \
                                   obs_type="image", action_type="discrete", visualize=False, \
-                                  screen_width=self.screen_width, screen_height=self.screen_height)
-        utils.EzPickle.__init__(self)
+                                  screen_width=self.screen_width, screen_height=self.screen_height, \
+                                  render_backend=render_backend)
+        utils.EzPickle.__init__(self, render_backend)
 
     def step(self, a):
         tau = np.zeros(self.robot_skeleton.ndofs)
@@ -65,7 +68,8 @@ class DartCartPoleImgEnv(dart_env.DartEnv, utils.EzPickle):
             self._get_viewer().runSingleStep()
 
     def _get_obs(self):
-        return self._get_viewer().getGrayscale(self.screen_width, self.screen_height)
+        # getGrayscale reuses its buffer, the agent may keep observations
+        return self._get_viewer().getGrayscale(self.screen_width, self.screen_height).copy()
 
     def reset_model(self):
         self.dart_world.reset()
@@ -3,37 +3,40 @@ __author__ = 'yuwenhao'
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment
 
 class DartCartPoleSwingUpEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.control_bounds = np.array([[1.0],[-1.0]])
         self.action_scale = 40
-        dart_env.DartEnv.__init__(self, 'cartpole_swingup.skel', 2, 4, self.control_bounds, dt=0.01)
-        utils.EzPickle.__init__(self)
+        dart_env.DartEnv.__init__(self, 'cartpole_swingup.skel', 2, 4, self.control_bounds, dt=0.01, disableViewer=disableViewer, render_backend=render_backend)
+        self.observation_layout = ObservationLayout(self.snapshot, [StateSegment('q'), StateSegment('dq')])
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def step(self, a):
         tau = np.zeros(self.robot_skeleton.ndofs)
         tau[0] = a[0] * self.action_scale
 
         self.do_simulation(tau, self.frame_skip)
+        snap = self.snapshot.update()
         ob = self._get_obs()
 
-        ang = self.robot_skeleton.q[1]
+        ang = snap.q[1]
 
         alive_bonus = 6.0
         ang_cost = 1.0*np.abs(ang)
         quad_ctrl_cost = 0.01 * np.square(a).sum()
-        com_cost = 0.01 * np.abs(self.robot_skeleton.q[0])
+        com_cost = 0.01 * np.abs(snap.q[0])
 
         reward = alive_bonus - ang_cost - quad_ctrl_cost - com_cost
 
-        done = abs(ang) > 8 * np.pi or abs(self.robot_skeleton.dq[1]) > 25 or abs(self.robot_skeleton.q[0]) > 5
+        done = abs(ang) > 8 * np.pi or abs(snap.dq[1]) > 25 or abs(snap.q[0]) > 5
 
         return ob, reward, bool(done), {}
 
 
     def _get_obs(self):
-        return np.concatenate([self.robot_skeleton.q, self.robot_skeleton.dq]).ravel()
+        return self.observation_layout.fill()
 
     def reset_model(self):
         self.dart_world.reset()
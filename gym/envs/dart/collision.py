@@ -0,0 +1,75 @@
+from gym import error, logger
+from gym.envs.dart.snapshot import find_bodynode
+
+# DART's collision detector ids, see pydart.World.*_COLLISION_DETECTOR
+DETECTORS = {'dart': 0, 'fcl': 1, 'bullet': 2, 'ode': 3}
+
+
+def set_collision_detector(world, names):
+    """Selects the first detector of `names` that this DART build provides
+    and returns its name."""
+    if isinstance(names, str):
+        names = [names]
+    for i, name in enumerate(names):
+        if name not in DETECTORS:
+            raise error.Error('Unknown collision detector {!r}; expected one of {}'.format(name, sorted(DETECTORS)))
+        try:
+            world.set_collision_detector(DETECTORS[name])
+        except Exception:
+            continue
+        if i > 0:
+            logger.warn('Collision detector %s is not available, using %s', names[0], name)
+        return name
+    raise error.Error('None of the collision detectors {} is available'.format(list(names)))
+
+
+class CollisionConfig(object):
+    """Collision settings of a DartEnv: which detector runs, and which body
+    pairs of the robot it has to check.
+
+    pydart2 cannot filter individual body pairs, so pairs are pruned with
+    the switches it does provide: self-collision, the adjacent-link check,
+    and per-body collidable flags. A non-collidable body is removed from
+    every pair, e.g. arms that should never touch the ground or the legs.
+
+    Settings left at None keep the value of the model file.
+
+    Args:
+        detector (str or list): detector name, or names in order of
+          preference: 'ode', 'bullet', 'fcl' or 'dart'.
+        self_collision (bool): check the robot's links against each other.
+        adjacent_body_check (bool): with self-collision, also check links
+          connected by a joint (which touch at the joint by construction).
+        noncollidable (list): names or indices of robot body nodes excluded
+          from collision detection.
+
+    Example usage:
+
+        self.configure_collision(CollisionConfig(detector=('ode', 'bullet'), self_collision=True))
+    """
+
+    def __init__(self, detector=None, self_collision=None, adjacent_body_check=None, noncollidable=()):
+        self.detector = detector
+        self.self_collision = self_collision
+        self.adjacent_body_check = adjacent_body_check
+        self.noncollidable = list(noncollidable)
+
+    def apply(self, world, *skels):
+        """Configures `world` and its robot skeleton (or the copies of the
+        robot of a replicated world) `skels`; returns the name of the
+        detector selected, if any."""
+        name = None
+        if self.detector is not None:
+            name = set_collision_detector(world, self.detector)
+        for skel in skels:
+            if self.self_collision is not None:
+                skel.set_self_collision_check(self.self_collision)
+            if self.adjacent_body_check is not None:
+                skel.set_adjacent_body_check(self.adjacent_body_check)
+            for query in self.noncollidable:
+                find_bodynode(skel, query).set_collidable(False)
+        return name
+
+    def __repr__(self):
+        return 'CollisionConfig(detector={!r}, self_collision={}, adjacent_body_check={}, noncollidable={})'.format(
+            self.detector, self.self_collision, self.adjacent_body_check, self.noncollidable)
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class ContactQuery(object):
+    """Array view of the contacts of a DartWorld's last step.
+
+    Nothing is read from DART until a query is made; the first query of a
+    step reads the raw contact records once (see `DartWorld.contact_data`)
+    and later queries in the same step reuse them.
+
+    Body nodes are identified by a global index: their index in their
+    skeleton plus the number of body nodes of the skeletons before it.
+    Look the indices of interesting body nodes up once with `body_index`.
+
+    Example usage:
+
+        self.feet = [self.contacts.body_index(self.robot_skeleton.bodynode('l-foot')), ...]
+        ...
+        self.contact_info = self.contacts.in_contact(self.feet, other_skel=0)
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self._num_skeletons = None
+        self._version = None
+
+    def _update_offsets(self):
+        skeletons = self.world.skeletons
+        counts = [len(skel.bodynodes) for skel in skeletons]
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(int)
+        self.num_bodies = int(self.offsets[-1])
+        self._num_skeletons = len(skeletons)
+
+    def _refresh(self):
+        world = self.world
+        if len(world.skeletons) != self._num_skeletons:
+            self._update_offsets()
+            self._version = None
+        if self._version == world.contacts_version:
+            return
+        data = world.contact_data()
+        self._points = data[:, 0:3]
+        self._forces = data[:, 3:6]
+        ids = data[:, 6:10].astype(int)
+        self._skel_ids = ids[:, [0, 2]]
+        body_ids = ids[:, [1, 3]]
+        valid = (self._skel_ids >= 0) & (body_ids >= 0)
+        self._bodies = np.where(valid, self.offsets[self._skel_ids] + body_ids, -1)
+        self._version = world.contacts_version
+
+    def body_index(self, bodynode):
+        """Global index of a pydart body node."""
+        if len(self.world.skeletons) != self._num_skeletons:
+            self._update_offsets()
+        return int(self.offsets[bodynode.skel.id] + bodynode.id)
+
+    @property
+    def num_contacts(self):
+        self._refresh()
+        return len(self._forces)
+
+    @property
+    def points(self):
+        """(n, 3) contact points."""
+        self._refresh()
+        return self._points
+
+    @property
+    def forces(self):
+        """(n, 3) contact forces, acting on the first body of each contact."""
+        self._refresh()
+        return self._forces
+
+    @property
+    def skel_ids(self):
+        """(n, 2) skeleton ids of the two sides of each contact."""
+        self._refresh()
+        return self._skel_ids
+
+    @property
+    def bodies(self):
+        """(n, 2) global body indices of the two sides of each contact, -1
+        where a side is not a body node."""
+        self._refresh()
+        return self._bodies
+
+    def total_force_sq(self):
+        """Sum over all contacts of the squared force components."""
+        return np.square(self.forces).sum()
+
+    def body_forces(self):
+        """(num_bodies, 3) net contact force on every body node: each
+        contact's force pushes its first body and, reversed, its second."""
+        forces, bodies = self.forces, self.bodies
+        # row num_bodies collects the sides that are not body nodes
+        index = np.where(bodies >= 0, bodies, self.num_bodies)
+        out = np.zeros((self.num_bodies + 1, 3))
+        for c in range(3):
+            out[:, c] = (np.bincount(index[:, 0], forces[:, c], minlength=self.num_bodies + 1) -
+                         np.bincount(index[:, 1], forces[:, c], minlength=self.num_bodies + 1))
+        return out[:-1]
+
+    def in_contact(self, bodies, other_skel=None):
+        """Returns a bool flag per global body index in `bodies`: whether the
+        body takes part in a contact, with skeleton `other_skel` if given."""
+        pairs, skel_ids = self.bodies, self.skel_ids
+        flags = np.zeros(len(bodies), dtype=bool)
+        for side in (0, 1):
+            ids = pairs[:, side]
+            if other_skel is not None:
+                ids = ids[skel_ids[:, 1 - side] == other_skel]
+            flags |= np.in1d(bodies, ids)
+        return flags
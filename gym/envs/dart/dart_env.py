@@ -1,21 +1,24 @@
 # Contributors: Wenhao Yu (wyu68@gatech.edu) and Dong Xu (donghsu@gatech.edu)
 
-import os
-
-from gym import error, spaces
+from gym import error, logger, spaces
 from gym.utils import seeding
 import numpy as np
-from os import path
 import gym
 import six
 
-
-from gym.envs.dart.static_window import *
+from gym.envs.dart import gui
 from gym.envs.dart.dart_world import *
+from gym.envs.dart.actuator import Actuator
+from gym.envs.dart import offscreen
+from gym.envs.dart.world_builder import get_world_builder
+from gym.envs.dart.snapshot import SkeletonSnapshot
+from gym.envs.dart.contacts import ContactQuery
+from gym.envs.dart.randomization import DomainRandomizer
+from gym.envs.dart.collision import CollisionConfig
+from gym.envs.dart.perturbation import PushPerturbation
 
 try:
     import pydart2 as pydart
-    from pydart2.gui.trackball import Trackball
     pydart.init()
 except ImportError as e:
     raise error.DependencyNotInstalled("{}. (HINT: you need to install pydart2.)".format(e))
@@ -25,11 +28,21 @@ class DartEnv(gym.Env):
     """Superclass for all Dart environments.
     """
 
+    # Attributes, besides the simulator state, that clone_state() and
+    # restore_state() carry: episode counters, targets, contact flags...
+    # Subclasses extend this with their own mutable per-episode fields.
+    state_fields = ('perturbation_schedule',)
+
+    # Whether the world records every frame (pydart's default). Envs that
+    # never replay their worlds can set this to False for faster steps.
+    record_world = True
+
     def __init__(self, model_paths, frame_skip, observation_size, action_bounds, \
                  dt=0.002, obs_type="parameter", action_type="continuous", visualize=True, disableViewer=False,\
-                 screen_width=80, screen_height=45):
+                 screen_width=80, screen_height=45, render_backend='glut'):
         assert obs_type in ('parameter', 'image')
         assert action_type in ("continuous", "discrete")
+        assert render_backend == 'glut' or render_backend in offscreen.BACKENDS
         print('pydart initialization OK')
 
         self.viewer = None
@@ -40,42 +53,27 @@ class DartEnv(gym.Env):
         if isinstance(model_paths, str):
             model_paths = [model_paths]
 
-        # convert everything to fullpath
-        full_paths = []
-        for model_path in model_paths:
-            if model_path.startswith("/"):
-                fullpath = model_path
-            else:
-                fullpath = os.path.join(os.path.dirname(__file__), "assets", model_path)
-            if not path.exists(fullpath):
-                raise IOError("File %s does not exist"%fullpath)
-            full_paths.append(fullpath)
-
-        if full_paths[0][-5:] == '.skel':
-            self.dart_world = DartWorld(dt, full_paths[0])
-        else:
-            self.dart_world = DartWorld(dt)
-            for fullpath in full_paths:
-                self.dart_world.add_skeleton(fullpath)
-
-
+        self.dart_world = self._build_world(model_paths, dt)
         self.robot_skeleton = self.dart_world.skeletons[-1] # assume that the skeleton of interest is always the last one
 
-        for jt in range(0, len(self.robot_skeleton.joints)):
-            for dof in range(len(self.robot_skeleton.joints[jt].dofs)):
-                if self.robot_skeleton.joints[jt].has_position_limit(dof):
-                    self.robot_skeleton.joints[jt].set_position_limit_enforced(True)
-
         self._obs_type = obs_type
         self.frame_skip= frame_skip
         self.visualize = visualize  #Show the window or not
         self.disableViewer = disableViewer
+        # 'glut' opens a (possibly hidden) window, 'egl'/'osmesa' render
+        # offscreen and need no X display, see offscreen.OffscreenRenderer
+        self.render_backend = render_backend
+
+        # random pushes, see set_perturbation
+        self.perturbation = None
+        # (probability, magnitude, bodyid) of the deprecated add_perturbation flag
+        self.perturbation_parameters = [0.05, 5, 2]
 
-        # random perturbation
-        self.add_perturbation = False
-        self.perturbation_parameters = [0.05, 5, 2] # probability, magnitude, bodyid, duration
-        self.perturbation_duration = 40
-        self.perturb_force = np.array([0, 0, 0])
+        # optional hydrodynamic drag (see fluid_drag.FluidDrag), applied every substep
+        self.fluid_drag = None
+
+        self._state_dtype = None
+        self._rollout_buffers = None
 
         #assert not done
         self.obs_dim = observation_size
@@ -85,14 +83,31 @@ class DartEnv(gym.Env):
         if action_type == "continuous":
             self.action_space = spaces.Box(action_bounds[1], action_bounds[0])
 
+        # clip/scale/scatter of actions into torques, shared by all subclasses
+        self.actuator = Actuator(action_bounds, getattr(self, 'action_scale', 1.0), self.robot_skeleton.ndofs)
+
+        # per-step kinematic cache and, for subclasses that declare one, the
+        # preallocated observation layout it feeds (see observation.py). The
+        # snapshot is refreshed by set_state and restore_state, and by the
+        # steps of the envs that read from it.
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton)
+        # contacts of the last step as arrays, read from DART on first use
+        self.contacts = ContactQuery(self.dart_world)
+        # collision settings applied by configure_collision, if any
+        self.collision_config = None
+        # dynamics randomized at every reset, see set_dynamics_randomization
+        self.randomizer = None
+        self.observation_layout = None
+
         self.track_skeleton_id = -1 # track the last skeleton's com by default
 
-        # initialize the viewer, get the window size
-        # initial here instead of in _render
-        # in image learning
+        # the viewer (a GLUT window or an offscreen renderer) is created on the
+        # first render() or image observation, so training processes that
+        # never render pay no GL setup cost and need no display
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self._get_viewer()
+        if disableViewer and obs_type == 'image':
+            raise error.Error('Image observations need a viewer; use an offscreen render_backend instead of disableViewer.')
         # Give different observation space for different kind of envs
         if self._obs_type == 'parameter':
             high = np.inf*np.ones(self.obs_dim)
@@ -118,6 +133,10 @@ class DartEnv(gym.Env):
         self.np_random, seed = seeding.np_random(seed)
         return [seed]
 
+    def _build_world(self, model_paths, dt):
+        # paths and joint-limit metadata are resolved once per process
+        return get_world_builder(model_paths, dt).build_world(self.record_world)
+
     # methods to override:
     # ----------------------------
     def reset_model(self):
@@ -138,58 +157,310 @@ class DartEnv(gym.Env):
     # -----------------------------
 
     def reset(self):
-        self.perturbation_duration = 0
+        if self.randomizer is not None:
+            self.randomizer.randomize()
+        if self.perturbation is not None:
+            self.perturbation.reset(self.np_random)
         ob = self.reset_model()
         return ob
 
+    def configure_collision(self, config=None, **kwargs):
+        """Applies a collision.CollisionConfig, or one built from `kwargs`,
+        to the world and the robot. Returns the name of the detector
+        selected, if any.
+        """
+        if config is None:
+            config = CollisionConfig(**kwargs)
+        self.collision_config = config
+        return config.apply(self.dart_world, self.robot_skeleton)
+
+    def set_dynamics_randomization(self, ranges):
+        """Randomizes the dynamics parameters in `ranges` at every reset,
+        drawing from `np_random` (see randomization.DomainRandomizer). The
+        nominal values are those at the time of this call. Pass None to stop
+        randomizing and restore them.
+        """
+        if self.randomizer is not None:
+            self.randomizer.restore_nominal()
+        self.randomizer = None if ranges is None else DomainRandomizer(self, ranges)
+
+    def set_perturbation(self, perturbation):
+        """Pushes the robot according to `perturbation`, a
+        perturbation.PushPerturbation whose schedule is redrawn from
+        `np_random` at every reset. Pass None to stop pushing.
+
+        Example usage:
+
+            env.unwrapped.set_perturbation(PushPerturbation(bodies=[2], probability=0.05, magnitude=5))
+        """
+        if perturbation is not None:
+            perturbation.bind(self.robot_skeleton)
+            perturbation.reset(self.np_random)
+        self.perturbation = perturbation
+
+    @property
+    def perturbation_schedule(self):
+        """(seed, scheduled horizon) of the push schedule, carried by
+        clone_state; (-1, 0) when the robot is not pushed."""
+        if self.perturbation is None:
+            return np.array([-1, 0], dtype=np.int64)
+        return self.perturbation.schedule_state()
+
+    @perturbation_schedule.setter
+    def perturbation_schedule(self, value):
+        if self.perturbation is not None and value[0] >= 0:
+            self.perturbation.restore_schedule(value[0], value[1])
+
+    # The add_perturbation flag and the perturb_force and
+    # perturbation_duration fields predate set_perturbation and are kept
+    # for old scripts.
+    @property
+    def add_perturbation(self):
+        return self.perturbation is not None
+
+    @add_perturbation.setter
+    def add_perturbation(self, value):
+        logger.warn('add_perturbation is deprecated; use set_perturbation(PushPerturbation(...)) instead.')
+        if value:
+            probability, magnitude, bodyid = self.perturbation_parameters[:3]
+            self.set_perturbation(PushPerturbation(bodies=[bodyid], probability=probability, magnitude=magnitude))
+        else:
+            self.set_perturbation(None)
+
+    @property
+    def perturb_force(self):
+        """The force of the push active at the current control step."""
+        push = None
+        if self.perturbation is not None:
+            push = self.perturbation.push(self.dart_world.frame // self.frame_skip)
+        return np.zeros(3) if push is None else push[1]
+
+    @property
+    def perturbation_duration(self):
+        return 0 if self.perturbation is None else self.perturbation.duration
+
+    @perturbation_duration.setter
+    def perturbation_duration(self, value):
+        logger.warn('perturbation_duration is deprecated and has no effect; pass duration to PushPerturbation instead.')
+
     def set_state(self, qpos, qvel):
         assert qpos.shape == (self.robot_skeleton.ndofs,) and qvel.shape == (self.robot_skeleton.ndofs,)
         self.robot_skeleton.set_positions(qpos)
         self.robot_skeleton.set_velocities(qvel)
+        self.snapshot.update()
 
     def set_state_vector(self, state):
         self.robot_skeleton.set_positions(state[0:int(len(state)/2)])
         self.robot_skeleton.set_velocities(state[int(len(state)/2):])
+        self.snapshot.update()
+
+    def set_observation_buffer(self, out):
+        """Makes the observation layout write straight into `out`, e.g. this
+        env's row of a vector env's observation matrix. step() and reset()
+        then return `out` itself. Returns False if the env has no layout.
+        """
+        if self.observation_layout is None:
+            return False
+        self.observation_layout.bind(out)
+        return True
+
+    def clone_state(self):
+        """Returns a snapshot of the environment as a NumPy structured record.
+
+        The record holds the positions and velocities of every skeleton in
+        the world, the simulation time and frame, and the attributes named
+        in `state_fields` (those that exist when the first snapshot is
+        taken). It is compact and picklable, so it can be sent to worker
+        processes, and `restore_state` brings this or any other instance of
+        the same env back to it. Stepping with the same actions from a
+        restored state replays the original trajectory bit for bit.
+
+        The push schedule of `set_perturbation` is carried as its seed and
+        horizon (`perturbation_schedule`) and regenerated on restore.
+
+        Not captured: the random number generators (branches from one state
+        can differ where a step draws random numbers), wrapper state such as
+        TimeLimit's step counter, the contact list of the last step,
+        which is recomputed by the next step, and the dynamics parameters
+        drawn by `set_dynamics_randomization`: a record restored from an
+        earlier episode is stepped with the current episode's masses,
+        frictions and so on.
+        """
+        world = self.dart_world
+        if self._state_dtype is None:
+            fields = [('time', np.float64), ('frame', np.int64), ('x', np.float64, (len(world.x),))]
+            for name in self.state_fields:
+                if hasattr(self, name):
+                    value = np.asarray(getattr(self, name))
+                    fields.append((name, value.dtype, value.shape))
+            self._state_dtype = np.dtype(fields)
+
+        state = np.zeros((), dtype=self._state_dtype)
+        state['time'] = world.t
+        state['frame'] = world.frame
+        state['x'] = world.x
+        for name in self._state_dtype.names[3:]:
+            state[name] = getattr(self, name)
+        return state[()]
+
+    def restore_state(self, state):
+        """Restores a snapshot taken by `clone_state`."""
+        world = self.dart_world
+        world.x = state['x']
+        world.set_time(state['time'])
+        world._frame = int(state['frame'])
+        for name in state.dtype.names[3:]:
+            value = state[name]
+            setattr(self, name, value.item() if value.ndim == 0 else np.array(value))
+        self.snapshot.update()
+
+    def rollout_branches(self, state, action_sequences):
+        """Runs each action sequence from `state`, e.g. the candidate plans of
+        a sampling-based planner or the expansions of a search tree node.
+
+        Args:
+            state: a record returned by `clone_state`.
+            action_sequences: (K, H, act_dim) array, K branches of H actions.
+
+        Returns:
+            rewards: (K, H) array. A branch stops at its first done, its
+              remaining rewards are zero.
+            dones: (K, H) bool array, True from the first done onwards.
+            final_states: (K,) array of records, the state at the end of each
+              branch.
+
+        The environment is left in `state`.
+        """
+        action_sequences = np.asarray(action_sequences)
+        num_branches, horizon = action_sequences.shape[:2]
+        rewards = np.zeros((num_branches, horizon))
+        dones = np.zeros((num_branches, horizon), dtype=bool)
+        final_states = np.zeros(num_branches, dtype=state.dtype)
+        for k in range(num_branches):
+            self.restore_state(state)
+            _, branch_rewards, branch_dones = self.rollout(action_sequences[k], observations=False)
+            steps = len(branch_rewards)
+            rewards[k, :steps] = branch_rewards
+            if branch_dones[-1]:
+                dones[k, steps - 1:] = True
+            final_states[k] = self.clone_state()
+        self.restore_state(state)
+        return rewards, dones, final_states
+
+    def rollout(self, actions, observations=True):
+        """Steps through an action sequence in one call, e.g. to evaluate a
+        plan from a state set with `set_state` or `restore_state`.
+
+        Args:
+            actions: (H, act_dim) array of actions, H >= 1.
+            observations (bool): if False, only the observation after the
+              last step is returned.
+
+        Returns:
+            obs: (T, obs_dim) observations after each of the T <= H steps
+              taken, or the (obs_dim,) last one if `observations` is False.
+            rewards: (T,) array.
+            dones: (T,) bool array; only the last entry can be True, as the
+              rollout stops at the first done.
+
+        The arrays are views of buffers reused by the next call; copy them
+        to keep them. Envs with an observation layout write each step's
+        observation straight into its row of `obs`.
+        """
+        actions = np.asarray(actions)
+        horizon = len(actions)
+        assert horizon > 0, 'rollout needs at least one action'
+        buffers = self._rollout_buffers
+        if buffers is None or len(buffers[1]) < horizon:
+            space = self.observation_space
+            dtype = space.dtype if space.dtype == np.uint8 else np.float64
+            buffers = (np.zeros((horizon,) + space.shape, dtype=dtype), np.zeros(horizon), np.zeros(horizon, dtype=bool))
+            self._rollout_buffers = buffers
+        obs, rewards, dones = buffers
+
+        layout = self.observation_layout
+        if layout is not None:
+            bound_buffer, bound_copy = layout.buffer, layout.copy
+        try:
+            for h in range(horizon):
+                row = h if observations else 0
+                if layout is not None:
+                    layout.bind(obs[row])
+                ob, rewards[h], dones[h], _ = self.step(actions[h])
+                if layout is None:
+                    obs[row] = ob
+                if dones[h]:
+                    break
+        finally:
+            if layout is not None:
+                layout.bind(bound_buffer, copy=bound_copy)
+        steps = h + 1
+        return (obs[:steps] if observations else obs[0]), rewards[:steps], dones[:steps]
 
     @property
     def dt(self):
         return self.dart_world.dt * self.frame_skip
 
     def do_simulation(self, tau, n_frames):
-        if self.add_perturbation:
-            if self.perturbation_duration == 0:
-                self.perturb_force *= 0
-                if np.random.random() < self.perturbation_parameters[0]:
-                    axis_rand = np.random.randint(0, 2, 1)[0]
-                    direction_rand = np.random.randint(0, 2, 1)[0] * 2 - 1
-                    self.perturb_force[axis_rand] = direction_rand * self.perturbation_parameters[1]
-
-            else:
-                self.perturbation_duration -= 1
+        push = None
+        if self.perturbation is not None:
+            push = self.perturbation.push(self.dart_world.frame // self.frame_skip)
+        if push is None and self.fluid_drag is None:
+            # nothing to apply between substeps: hold tau across all of them
+            self.dart_world.step_with_forces(self.robot_skeleton, tau, n_frames)
+            return
 
         for _ in range(n_frames):
-            if self.add_perturbation:
-                self.robot_skeleton.bodynodes[self.perturbation_parameters[2]].add_ext_force(self.perturb_force)
+            if push is not None:
+                # DART clears external forces after every substep
+                push[0].add_ext_force(push[1])
+            if self.fluid_drag is not None:
+                self.fluid_drag.apply()
 
             self.robot_skeleton.set_forces(tau)
             self.dart_world.step()
 
     def render(self, mode='human', close=False):
-        if not self.disableViewer:
-            self._get_viewer().scene.tb.trans[0] = -self.dart_world.skeletons[self.track_skeleton_id].com()[0]*1
         if close:
             if self.viewer is not None:
                 self._get_viewer().close()
                 self.viewer = None
             return
+        if self.disableViewer:
+            return
 
+        # create the viewer (and run viewer_setup) before reading track_skeleton_id
+        viewer = self._get_viewer()
+        viewer.scene.tb.trans[0] = -self.dart_world.skeletons[self.track_skeleton_id].com()[0]*1
         if mode == 'rgb_array':
-            data = self._get_viewer().getFrame()
+            data = viewer.getFrame()
             return data
         elif mode == 'human':
-            self._get_viewer().runSingleStep()
+            viewer.runSingleStep()
+
+    def close(self):
+        if self.viewer is not None:
+            self.viewer.close()
+            self.viewer = None
+        if self.dart_world is not None:
+            self.dart_world.destroy()
+            self.dart_world = None
 
     def getViewer(self, sim, title=None):
+        # the GL/GLUT stack is imported with the first viewer, so processes
+        # that never render need neither it nor libGL
+        gui.load()
+        from pydart2.gui.trackball import Trackball
+        if self.render_backend != 'glut':
+            if self._obs_type == 'image':
+                win = offscreen.OffscreenRenderer(sim, self.screen_width, self.screen_height, self.render_backend, title)
+            else:
+                win = offscreen.OffscreenRenderer(sim, backend=self.render_backend, title=title)
+            win.scene.add_camera(Trackball(theta=-45.0, phi = 0.0, zoom=0.1), 'gym_camera')
+            win.scene.set_camera(win.scene.num_cameras()-1)
+            return win
+
+        from gym.envs.dart.static_window import StaticGLUTWindow
         # glutInit(sys.argv)
         win = StaticGLUTWindow(sim, title)
         win.scene.add_camera(Trackball(theta=-45.0, phi = 0.0, zoom=0.1), 'gym_camera')
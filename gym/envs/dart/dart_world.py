@@ -1,11 +1,103 @@
 import pydart2 as pydart
+import pydart2.pydart2_api as papi
 import numpy as np
 
 # custom pydart world
 class DartWorld(pydart.World):
+    """pydart world whose contacts are read lazily.
+
+    pydart.World.step rebuilds `collision_result` after every step, creating
+    a Contact object per contact and resolving its body nodes, and records
+    the state and contacts of every frame. Here `collision_result` is only
+    brought up to date when it is read, and `contact_data()` returns the raw
+    contact records as one array.
+
+    Recording stays on, as in pydart, unless the world is created with
+    `record=False` (or `disable_recording()` is called). Without it, and
+    without skeleton controllers, `step_with_forces` steps through the C
+    API directly.
+    """
+
     def __init__(self, *args, **kwargs):
-        pydart.World.__init__(self, *args, **kwargs)
+        record = kwargs.pop('record', True)
         self.arrows = [] # [from, to]
+        # bumped whenever DART's collision result changes (step, reset, check_collision)
+        self.contacts_version = 0
+        self._collision_result = None
+        self._collision_result_version = -1
+        self._contact_data = np.zeros((0, 10))
+        self._contact_data_version = -1
+        pydart.World.__init__(self, *args, **kwargs)
+        if not record:
+            self.disable_recording()
+
+    @property
+    def collision_result(self):
+        if self._collision_result_version != self.contacts_version:
+            self._collision_result.update()
+            self._collision_result_version = self.contacts_version
+        return self._collision_result
+
+    @collision_result.setter
+    def collision_result(self, result):
+        self._collision_result = result
+        self._collision_result_version = self.contacts_version
+
+    def contact_data(self):
+        """Returns the contacts of the last step as an (n, 10) array with
+        rows (point[3], force[3], skel_id1, bodynode_id1, skel_id2,
+        bodynode_id2), read from DART at most once per step.
+        """
+        if self._contact_data_version != self.contacts_version:
+            n = papi.collisionresult__getNumContacts(self.id)
+            self._contact_data = np.reshape(papi.collisionresult__getContacts(self.id, n * 10), (n, 10))
+            self._contact_data_version = self.contacts_version
+        return self._contact_data
+
+    def step(self):
+        for skel in self.skeletons:
+            if skel.controller is not None:
+                skel.tau = skel.controller.compute()
+
+        papi.world__step(self.id)
+        self._frame += 1
+        self.contacts_version += 1
+        if self.recording:
+            self.recording.bake()
+
+    def step_with_forces(self, skel, tau, n_frames):
+        """Takes `n_frames` steps holding the generalized forces `tau` on
+        `skel`. DART clears commanded forces after every step, so they are
+        written again before each one, straight through the C API.
+        """
+        self.step_with_batch_forces([skel], [tau], n_frames)
+
+    def step_with_batch_forces(self, skels, taus, n_frames):
+        """Like `step_with_forces`, holding `taus[i]` on `skels[i]` for every
+        skeleton, e.g. the copies of a robot in a replicated world.
+        """
+        if self.recording or any(s.controller is not None for s in self.skeletons):
+            for _ in range(n_frames):
+                for skel, tau in zip(skels, taus):
+                    skel.set_forces(tau)
+                self.step()
+            return
+        wid = self.id
+        forces = []
+        for skel, tau in zip(skels, taus):
+            tau = np.ascontiguousarray(tau, dtype=np.float64)
+            skel._tau = tau
+            forces.append((skel.id, tau))
+        for _ in range(n_frames):
+            for skid, tau in forces:
+                papi.skeleton__setForces(wid, skid, tau)
+            papi.world__step(wid)
+        self._frame += n_frames
+        self.contacts_version += 1
+
+    def check_collision(self):
+        papi.world__checkCollision(self.id)
+        self.contacts_version += 1
 
     def on_key_press(self, key):
         pass
@@ -17,6 +109,13 @@ class DartWorld(pydart.World):
             ri.set_color(1.0, 0.0, 0.0)
             ri.render_arrow(p0, p1, r_base=0.025, head_width=0.05, head_len=0.1)
 
+    def set_time(self, t):
+        papi.world__setTime(self.id, t)
+
     def reset(self):
         self.arrows = []
-        pydart.World.reset(self)
\ No newline at end of file
+        # a reset world has no contacts until its next step
+        self.contacts_version += 1
+        pydart.World.reset(self)
+        self._contact_data = np.zeros((0, 10))
+        self._contact_data_version = self.contacts_version
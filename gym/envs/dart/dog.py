@@ -4,40 +4,41 @@ __author__ = 'yuwenhao'
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 
 
 class DartDogEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.control_bounds = np.array([[1.0]*16,[-1.0]*16])
         self.action_scale = 200
         obs_dim = 43
 
-        dart_env.DartEnv.__init__(self, 'dog.skel', 4, obs_dim, self.control_bounds, disableViewer=False)
+        dart_env.DartEnv.__init__(self, 'dog.skel', 4, obs_dim, self.control_bounds, disableViewer=disableViewer, render_backend=render_backend)
 
-        utils.EzPickle.__init__(self)
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [0])
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            StateSegment('q', slice(1, None)),
+            StateSegment('dq', clip=(-10, 10)),
+        ])
+
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def step(self, a):
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.zeros(self.robot_skeleton.ndofs)
-        tau[6:] = clamped_control * self.action_scale
+        tau = self.actuator.torques(a)
 
         posbefore = self.robot_skeleton.bodynodes[0].com()[0]
         self.do_simulation(tau, self.frame_skip)
-        posafter = self.robot_skeleton.bodynodes[0].com()[0]
-        height = self.robot_skeleton.bodynodes[0].com()[1]
-        side_deviation = abs(self.robot_skeleton.bodynodes[0].com()[2])
+        snap = self.snapshot.update()
+        posafter, height, side_deviation = snap.com(0)
+        side_deviation = abs(side_deviation)
 
         alive_bonus = 1.0
         reward = 0.6*(posafter - posbefore) / self.dt
         reward += alive_bonus
         reward -= 1e-3 * np.square(a).sum()
 
-        s = self.state_vector()
+        s = snap.x
         done = not (np.isfinite(s).all() and (np.abs(s[2:]) < 100).all() and
                     (height > .7) and (height < 1.8) and (side_deviation < .4))
         ob = self._get_obs()
@@ -45,12 +46,7 @@ class DartDogEnv(dart_env.DartEnv, utils.EzPickle):
         return ob, reward, done, {}
 
     def _get_obs(self):
-        state =  np.concatenate([
-            self.robot_skeleton.q[1:],
-            np.clip(self.robot_skeleton.dq,-10,10)
-        ])
-
-        return state
+        return self.observation_layout.fill()
 
     def reset_model(self):
         self.dart_world.reset()
@@ -0,0 +1,42 @@
+"""
+Deferred loading of pydart2's GUI stack.
+
+`import pydart2` also imports `pydart2.gui`, which loads OpenGL, GLUT and,
+if available, PyQt5, although training processes never open a viewer.
+`defer()`, called by gym.envs.dart before pydart2 is first imported, puts
+a placeholder module in its place; `load()` swaps in the real package when
+the first viewer is created. If pydart2 has already been imported
+elsewhere, its GUI is loaded already and both calls do nothing.
+"""
+
+import importlib
+import sys
+import types
+
+from gym import error
+
+
+def defer():
+    """Keeps the next `import pydart2` from importing pydart2.gui."""
+    if 'pydart2' in sys.modules or 'pydart2.gui' in sys.modules:
+        return
+    placeholder = types.ModuleType('pydart2.gui', 'Placeholder until gym.envs.dart.gui.load() is called.')
+    placeholder._deferred = True
+    sys.modules['pydart2.gui'] = placeholder
+
+
+def is_loaded():
+    return not getattr(sys.modules.get('pydart2.gui'), '_deferred', False)
+
+
+def load():
+    """Imports pydart2.gui (and with it OpenGL and GLUT) if it was deferred."""
+    if is_loaded():
+        return
+    del sys.modules['pydart2.gui']
+    try:
+        gui = importlib.import_module('pydart2.gui')
+    except ImportError as e:
+        raise error.DependencyNotInstalled("{}. (HINT: rendering Dart envs needs PyOpenGL and freeglut, "
+                                           "or an offscreen render_backend.)".format(e))
+    sys.modules['pydart2'].gui = gui
@@ -3,7 +3,9 @@ from gym import utils
 from gym.envs.dart import dart_env
 
 class DartHalfCheetahEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('t', 'cur_step', 'height_threshold_low', 'fall_on_ground')
+
+    def __init__(self, disableViewer=True, render_backend='glut'):
         self.control_bounds = np.array([[1.0]*6,[-1.0]*6])
         self.action_scale = np.array([120, 90, 60, 120, 60, 30]) * 1.0
         obs_dim = 17
@@ -14,27 +16,19 @@ class DartHalfCheetahEnv(dart_env.DartEnv, utils.EzPickle):
 
         self.total_dist = []
 
-        dart_env.DartEnv.__init__(self, ['half_cheetah.skel'], 5, obs_dim, self.control_bounds, disableViewer=True, dt=0.01)
+        dart_env.DartEnv.__init__(self, ['half_cheetah.skel'], 5, obs_dim, self.control_bounds, disableViewer=disableViewer, dt=0.01, render_backend=render_backend)
 
         self.initial_local_coms = [np.copy(bn.local_com()) for bn in self.robot_skeleton.bodynodes]
 
-        self.dart_world.set_collision_detector(3)
+        self.configure_collision(detector='ode')
 
         self.robot_skeleton=self.dart_world.skeletons[-1]
 
-        utils.EzPickle.__init__(self)
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def advance(self, a):
         self.posbefore = self.robot_skeleton.q[0]
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-
-        tau = np.zeros(self.robot_skeleton.ndofs)
-        tau[3:] = clamped_control * self.action_scale
+        tau = self.actuator.torques(a)
         self.do_simulation(tau, self.frame_skip)
 
     def terminated(self):
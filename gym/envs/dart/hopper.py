@@ -1,52 +1,49 @@
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment, FeatureSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 
 
 class DartHopperEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.control_bounds = np.array([[1.0, 1.0, 1.0],[-1.0, -1.0, -1.0]])
         self.action_scale = 200
         obs_dim = 11
 
-        dart_env.DartEnv.__init__(self, 'hopper_capsule.skel', 4, obs_dim, self.control_bounds, disableViewer=False)
+        dart_env.DartEnv.__init__(self, 'hopper_capsule.skel', 4, obs_dim, self.control_bounds, disableViewer=disableViewer, render_backend=render_backend)
 
-        try:
-            self.dart_world.set_collision_detector(3)
-        except Exception as e:
-            print('Does not have ODE collision detector, reverted to bullet collision detector')
-            self.dart_world.set_collision_detector(2)
-        
+        self.configure_collision(detector=('ode', 'bullet'))
 
-        utils.EzPickle.__init__(self)
+        # the height of the torso (body node 2) replaces the root x position
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [2])
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            FeatureSegment(1, self._torso_height),
+            StateSegment('q', slice(2, None)),
+            StateSegment('dq', clip=(-10, 10)),
+        ])
+
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
 
     def advance(self, a):
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.zeros(self.robot_skeleton.ndofs)
-        tau[3:] = clamped_control * self.action_scale
+        tau = self.actuator.torques(a)
 
         self.do_simulation(tau, self.frame_skip)
 
     def step(self, a):
-        pre_state = [self.state_vector()]
-
         posbefore = self.robot_skeleton.q[0]
         self.advance(a)
-        posafter,ang = self.robot_skeleton.q[0,2]
-        height = self.robot_skeleton.bodynodes[2].com()[1]
+        snap = self.snapshot.update()
+        posafter, ang = snap.q[0], snap.q[2]
+        height = snap.com(2)[1]
 
 
         joint_limit_penalty = 0
         for j in [-2]:
-            if (self.robot_skeleton.q_lower[j] - self.robot_skeleton.q[j]) > -0.05:
+            if (snap.q_lower[j] - snap.q[j]) > -0.05:
                 joint_limit_penalty += abs(1.5)
-            if (self.robot_skeleton.q_upper[j] - self.robot_skeleton.q[j]) < 0.05:
+            if (snap.q_upper[j] - snap.q[j]) < 0.05:
                 joint_limit_penalty += abs(1.5)
 
         alive_bonus = 1.0
@@ -57,7 +54,7 @@ class DartHopperEnv(dart_env.DartEnv, utils.EzPickle):
         # uncomment the line below to enable joint limit penalty, which helps learning
         #reward -= 5e-1 * joint_limit_penalty
 
-        s = self.state_vector()
+        s = snap.x
         done = not (np.isfinite(s).all() and (np.abs(s[2:]) < 100).all() and
                     (height > .7) and (height < 1.8) and (abs(ang) < .2))
         ob = self._get_obs()
@@ -65,13 +62,10 @@ class DartHopperEnv(dart_env.DartEnv, utils.EzPickle):
         return ob, reward, done, {}
 
     def _get_obs(self):
-        state =  np.concatenate([
-            self.robot_skeleton.q[1:],
-            np.clip(self.robot_skeleton.dq,-10,10)
-        ])
-        state[0] = self.robot_skeleton.bodynodes[2].com()[1]
+        return self.observation_layout.fill()
 
-        return state
+    def _torso_height(self, out):
+        out[0] = self.snapshot.com(2)[1]
 
     def reset_model(self):
         self.dart_world.reset()
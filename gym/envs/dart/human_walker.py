@@ -3,6 +3,8 @@ __author__ = 'yuwenhao'
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment, FeatureSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 import joblib
 import os
 
@@ -13,7 +15,9 @@ import pydart2 as pydart
 # human model with human-like joint limit
 # Refer to https://arxiv.org/abs/1709.08685 for more details
 class DartHumanWalkerEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('t', 'contact_info', 'init_pos', 'init_height')
+
+    def __init__(self, disableViewer=True, render_backend='glut'):
         self.control_bounds = np.array([[1.0] * 23, [-1.0] * 23])
         self.action_scale = np.array([120, 120, 120, 100, 60, 60, 120, 120, 120, 100, 60, 60, 100, 100, 100, 80,80,80, 50, 80,80,80, 50])*1.5
         obs_dim = 57
@@ -27,7 +31,7 @@ class DartHumanWalkerEnv(dart_env.DartEnv, utils.EzPickle):
             obs_dim += len(self.contact_info)
 
         dart_env.DartEnv.__init__(self, 'kima/kima_human_edited.skel', 15, obs_dim, self.control_bounds,
-                                      disableViewer=True, dt=0.002)
+                                      disableViewer=disableViewer, dt=0.002, render_backend=render_backend)
 
         # add human joint limit
         # Dart with modified joint limit is required: https://github.com/jyf588/dart/tree/human-joint-constraints
@@ -50,60 +54,43 @@ class DartHumanWalkerEnv(dart_env.DartEnv, utils.EzPickle):
             leftlegConstraint.add_to_world(world)
             rightlegConstraint.add_to_world(world)
 
-        self.robot_skeleton.set_self_collision_check(False)
-
-        self.sim_dt = self.dt / self.frame_skip
+        self.configure_collision(self_collision=False)
 
-        utils.EzPickle.__init__(self)
+        # pelvis (body node 1) and head drive the reward and termination terms
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [1, 'head'])
+        segments = [StateSegment('q', slice(1, None)), StateSegment('dq', clip=(-10, 10))]
+        if self.include_additional_info:
+            segments.append(FeatureSegment(2, self._contact_feature))
+        self.observation_layout = ObservationLayout(self.snapshot, segments)
+        self.feet = [self.contacts.body_index(self.robot_skeleton.bodynode('l-foot')),
+                     self.contacts.body_index(self.robot_skeleton.bodynode('r-foot'))]
 
+        self.sim_dt = self.dt / self.frame_skip
 
-    def do_simulation(self, tau, n_frames):
-        for _ in range(n_frames):
-            self.robot_skeleton.set_forces(tau)
-            self.dart_world.step()
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def advance(self, a):
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.zeros(self.robot_skeleton.ndofs)
-        tau[6:] = clamped_control * self.action_scale
+        tau = self.actuator.torques(a)
 
         self.do_simulation(tau, self.frame_skip)
 
     def step(self, a):
         posbefore = self.robot_skeleton.bodynodes[1].com()[0]
         self.advance(np.copy(a))
-        posafter = self.robot_skeleton.bodynodes[1].com()[0]
-        height = self.robot_skeleton.bodynode('head').com()[1]
-        side_deviation = self.robot_skeleton.bodynode('head').com()[2]
-        angle = self.robot_skeleton.q[3]
-
-        upward = np.array([0, 1, 0])
-        upward_world = self.robot_skeleton.bodynode('head').to_world(np.array([0, 1, 0])) - self.robot_skeleton.bodynode('head').to_world(np.array([0, 0, 0]))
-        upward_world /= np.linalg.norm(upward_world)
-        ang_cos_uwd = np.dot(upward, upward_world)
-        ang_cos_uwd = np.arccos(ang_cos_uwd)
-
-        forward = np.array([1, 0, 0])
-        forward_world = self.robot_skeleton.bodynode('head').to_world(np.array([1, 0, 0])) - self.robot_skeleton.bodynode('head').to_world(np.array([0, 0, 0]))
-        forward_world /= np.linalg.norm(forward_world)
-        ang_cos_fwd = np.dot(forward, forward_world)
-        ang_cos_fwd = np.arccos(ang_cos_fwd)
-
-        contacts = self.dart_world.collision_result.contacts
-        total_force_mag = 0
-        self.contact_info = np.array([0, 0])
-        for contact in contacts:
-            total_force_mag += np.square(contact.force).sum()
-            if contact.skel_id1 + contact.skel_id2 == 1:
-                if contact.bodynode1 == self.robot_skeleton.bodynode('l-foot') or contact.bodynode2 == self.robot_skeleton.bodynode('l-foot'):
-                    self.contact_info[0] = 1
-                if contact.bodynode1 == self.robot_skeleton.bodynode('r-foot') or contact.bodynode2 == self.robot_skeleton.bodynode('r-foot'):
-                    self.contact_info[1] = 1
+        snap = self.snapshot.update()
+        posafter = snap.com(1)[0]
+        height = snap.com('head')[1]
+        side_deviation = snap.com('head')[2]
+        angle = snap.q[3]
+
+        upward_world = snap.axis('head', 1) / np.linalg.norm(snap.axis('head', 1))
+        ang_cos_uwd = np.arccos(upward_world[1])
+
+        forward_world = snap.axis('head', 0) / np.linalg.norm(snap.axis('head', 0))
+        ang_cos_fwd = np.arccos(forward_world[0])
+
+        # feet touching the ground (skeleton 0)
+        self.contact_info = self.contacts.in_contact(self.feet, other_skel=0).astype(int)
 
 
         alive_bonus = 2.0
@@ -118,11 +105,11 @@ class DartHumanWalkerEnv(dart_env.DartEnv, utils.EzPickle):
 
         self.t += self.dt
 
-        s = self.state_vector()
+        s = snap.x
 
         done = not (np.isfinite(s).all() and (np.abs(s[2:]) < 100).all() and
                     (height-self.init_height > -0.2) and (height-self.init_height < 1.0) and (abs(ang_cos_uwd) < 2.0) and (abs(ang_cos_fwd) < 2.0)
-                    and np.abs(angle) < 1.3 and np.abs(self.robot_skeleton.q[5]) < 0.4 and np.abs(side_deviation) < 0.9)
+                    and np.abs(angle) < 1.3 and np.abs(snap.q[5]) < 0.4 and np.abs(side_deviation) < 0.9)
 
         if done:
             reward = 0
@@ -138,15 +125,10 @@ class DartHumanWalkerEnv(dart_env.DartEnv, utils.EzPickle):
                                   'dyn_model_id': 0, 'state_index': 0}
 
     def _get_obs(self):
-        state = np.concatenate([
-            self.robot_skeleton.q[1:],
-            np.clip(self.robot_skeleton.dq, -10, 10),
-        ])
-
-        if self.include_additional_info:
-            state = np.concatenate([state, self.contact_info])
+        return self.observation_layout.fill()
 
-        return state
+    def _contact_feature(self, out):
+        out[:] = self.contact_info
 
     def reset_model(self):
         self.dart_world.reset()
@@ -155,12 +137,13 @@ class DartHumanWalkerEnv(dart_env.DartEnv, utils.EzPickle):
 
         self.set_state(qpos, qvel)
         self.t = 0
+        snap = self.snapshot
 
-        self.init_pos = self.robot_skeleton.q[0]
+        self.init_pos = snap.q[0]
 
         self.contact_info = np.array([0, 0])
 
-        self.init_height = self.robot_skeleton.bodynode('head').C[1]
+        self.init_height = snap.com('head')[1]
 
         return self._get_obs()
 
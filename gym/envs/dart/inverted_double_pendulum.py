@@ -6,12 +6,12 @@ from gym.envs.dart import dart_env
 
 # swing up and balance of double inverted pendulum
 class DartDoubleInvertedPendulumEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    def __init__(self, disableViewer=False, render_backend='glut'):
         control_bounds = np.array([[1.0],[-1.0]])
         self.action_scale = 40
         dart_env.DartEnv.__init__(
-            self, 'inverted_double_pendulum.skel', 2, 8, control_bounds, dt=0.01)
-        utils.EzPickle.__init__(self)
+            self, 'inverted_double_pendulum.skel', 2, 8, control_bounds, dt=0.01, disableViewer=disableViewer, render_backend=render_backend)
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
         self.init_qpos = np.array(self.robot_skeleton.q).copy()
         self.init_qvel = np.array(self.robot_skeleton.dq).copy()
@@ -0,0 +1,157 @@
+import collections
+import multiprocessing
+import pickle
+import time
+
+import numpy as np
+
+Linearization = collections.namedtuple('Linearization', ['A', 'B', 'x', 'u', 'x_next', 'elapsed'])
+Linearization.__doc__ = """Step dynamics x_next + A dx + B du around (x, u).
+
+x is the robot's state vector (positions, then velocities), u the action,
+and `elapsed` the wall-clock seconds the linearization took.
+"""
+
+
+def _step_from(env, state, x, u):
+    """One env step from `state` with the robot's state vector set to `x`;
+    returns the next state vector."""
+    env.restore_state(state)
+    env.set_state_vector(x)
+    env.step(u)
+    return env.state_vector()
+
+
+def _env_setup(env):
+    """The settings made on `env` after construction, which its pickle
+    (the constructor arguments) does not carry."""
+    randomizer = env.randomizer
+    return {
+        'collision_config': env.collision_config,
+        'randomization': None if randomizer is None else (randomizer.ranges, randomizer.values),
+        'perturbation': env.perturbation,
+    }
+
+
+def _apply_setup(env, setup):
+    if setup['collision_config'] is not None:
+        env.configure_collision(setup['collision_config'])
+    env.set_dynamics_randomization(None)
+    if setup['randomization'] is not None:
+        ranges, values = setup['randomization']
+        env.set_dynamics_randomization(ranges)
+        env.randomizer.set_values(values)
+    # the schedule itself comes with each task's state record
+    env.set_perturbation(setup['perturbation'])
+
+
+_worker_env = None
+_worker_setup = None
+
+
+def _init_worker(pickled_env):
+    global _worker_env
+    _worker_env = pickle.loads(pickled_env)
+
+
+def _worker_step(args):
+    global _worker_setup
+    setup, task = args[0], args[1:]
+    if setup != _worker_setup:
+        _apply_setup(_worker_env, pickle.loads(setup))
+        _worker_setup = setup
+    return _step_from(_worker_env, *task)
+
+
+class Linearizer(object):
+    """Finite-difference linearization of a DartEnv's step dynamics, for
+    iLQR/DDP-style controllers.
+
+    Each column of A = d x_next / d x and B = d x_next / d u comes from
+    env steps with one component of (x, u) perturbed by `eps`, each
+    starting from the same `clone_state` record. That record also holds
+    the env-specific fields (`state_fields`), so no per-env code is needed.
+    Actions are clipped by the env's actuator, so B is zero for components
+    at their bounds. Pushes set with `set_perturbation` are replayed in
+    every perturbed step.
+
+    Args:
+        env: a DartEnv, possibly wrapped.
+        eps (float): perturbation size.
+        central (bool): central differences (two steps per column) rather
+          than forward differences (one step per column, plus one).
+        processes (int): if > 0, columns are computed by a pool of this many
+          worker processes, each holding a copy of the env rebuilt from its
+          pickle (DartEnv subclasses pickle their constructor arguments).
+          The collision config, the current randomized dynamics and the
+          push settings of the env are sent along with every batch of
+          columns and applied by the workers when they change.
+        context (Optional[str]): multiprocessing start method of the pool.
+
+    Example usage:
+
+        linearizer = Linearizer(gym.make('DartHopper-v1'), eps=1e-5)
+        lin = linearizer.linearize(action=np.zeros(3))
+        print(lin.A.shape, lin.B.shape, lin.elapsed)
+    """
+
+    def __init__(self, env, eps=1e-6, central=True, processes=0, context=None):
+        self.env = env.unwrapped
+        self.eps = eps
+        self.central = central
+        self.processes = processes
+        self.context = context
+        self._pool = None
+
+    def _map(self, tasks):
+        if not self.processes:
+            return [_step_from(self.env, *task) for task in tasks]
+        if self._pool is None:
+            ctx = multiprocessing.get_context(self.context)
+            self._pool = ctx.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(pickle.dumps(self.env),))
+        setup = pickle.dumps(_env_setup(self.env))
+        return self._pool.map(_worker_step, [(setup,) + task for task in tasks])
+
+    def linearize(self, state=None, action=None):
+        """Linearizes the step from `state` (a `clone_state` record, by
+        default the env's current state) under `action` (default zeros).
+        The env is left in `state`. Returns a Linearization.
+        """
+        start = time.time()
+        env = self.env
+        if state is None:
+            state = env.clone_state()
+        if action is None:
+            action = np.zeros(env.action_space.shape)
+        u = np.array(action, dtype=np.float64)
+        env.restore_state(state)
+        x = env.state_vector()
+        nx, nu = len(x), len(u)
+
+        tasks = [(state, x, u)]
+        signs = (1, -1) if self.central else (1,)
+        for j in range(nx + nu):
+            for sign in signs:
+                dx, du = x.copy(), u.copy()
+                if j < nx:
+                    dx[j] += sign * self.eps
+                else:
+                    du[j - nx] += sign * self.eps
+                tasks.append((state, dx, du))
+        results = self._map(tasks)
+        env.restore_state(state)
+
+        x_next = results[0]
+        if self.central:
+            columns = [(results[1 + 2 * j] - results[2 + 2 * j]) / (2 * self.eps) for j in range(nx + nu)]
+        else:
+            columns = [(results[1 + j] - x_next) / self.eps for j in range(nx + nu)]
+        jacobian = np.stack(columns, axis=1)
+        return Linearization(jacobian[:, :nx], jacobian[:, nx:], x, u, x_next, time.time() - start)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class StateSegment(object):
+    """Part of the state vector: `snapshot.q` or `snapshot.dq` indexed by
+    `index`, optionally clipped to `clip = (low, high)`."""
+
+    def __init__(self, name, index=slice(None), clip=None):
+        assert name in ('q', 'dq')
+        self.name = name
+        self.index = index
+        self.clip = clip
+
+    def size(self, snapshot):
+        return len(getattr(snapshot, self.name)[self.index])
+
+    def fill(self, snapshot, out):
+        source = getattr(snapshot, self.name)[self.index]
+        if self.clip is None:
+            np.copyto(out, source)
+        else:
+            np.clip(source, self.clip[0], self.clip[1], out=out)
+
+
+class FeatureSegment(object):
+    """`size` extra values written by `fn(out)`, e.g. a body height, contact
+    flags or the previous action."""
+
+    def __init__(self, size, fn):
+        self._size = size
+        self.fn = fn
+
+    def size(self, snapshot):
+        return self._size
+
+    def fill(self, snapshot, out):
+        self.fn(out)
+
+
+class ObservationLayout(object):
+    """Declarative description of a DART observation vector.
+
+    The observation is the concatenation of `segments`, each filled from a
+    SkeletonSnapshot (or by a feature function) into its slice of one
+    preallocated buffer, so assembling an observation creates no temporary
+    arrays. Call `snapshot.update()` before `fill()`.
+
+    By default `fill()` returns a copy of the buffer, like a freshly built
+    observation. After `bind(out)` the segments are written straight into
+    `out` (for instance a row of a vector env's shared observation matrix)
+    and `fill()` returns `out` itself, which the next call overwrites.
+
+    Example usage:
+
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            StateSegment('q', slice(1, None)),
+            StateSegment('dq', clip=(-10, 10)),
+        ])
+    """
+
+    def __init__(self, snapshot, segments):
+        self.snapshot = snapshot
+        self.segments = list(segments)
+        self.slices = []
+        start = 0
+        for segment in self.segments:
+            size = segment.size(snapshot)
+            self.slices.append(slice(start, start + size))
+            start += size
+        self.size = start
+        self._set_buffer(np.zeros(self.size))
+        self.copy = True
+
+    def _set_buffer(self, out):
+        self.buffer = out
+        self._views = [out[s] for s in self.slices]
+
+    def bind(self, out, copy=False):
+        assert out.shape == (self.size,), 'expected a buffer of shape ({},)'.format(self.size)
+        self._set_buffer(out)
+        self.copy = copy
+
+    def fill(self):
+        snapshot = self.snapshot
+        for segment, view in zip(self.segments, self._views):
+            segment.fill(snapshot, view)
+        return self.buffer.copy() if self.copy else self.buffer
@@ -0,0 +1,173 @@
+import ctypes
+import os
+import sys
+
+import numpy as np
+
+from gym import error
+
+BACKENDS = ('egl', 'osmesa')
+
+
+def rgba_to_grayscale(rgba, out, scratch):
+    """Converts an (h, w, 4) uint8 image to grayscale in `out` (h, w).
+
+    Uses the integer ITU-R 601-2 luma transform of PIL's `convert('L')`, so
+    the result is identical to the previous PIL round trip. `scratch` is a
+    (2, h, w) uint32 work buffer.
+    """
+    acc, tmp = scratch[0], scratch[1]
+    np.multiply(rgba[..., 0], 19595, out=acc, dtype=np.uint32)
+    np.multiply(rgba[..., 1], 38470, out=tmp, dtype=np.uint32)
+    acc += tmp
+    np.multiply(rgba[..., 2], 7471, out=tmp, dtype=np.uint32)
+    acc += tmp
+    acc += 0x8000
+    acc >>= 16
+    np.copyto(out, acc, casting='unsafe')
+    return out
+
+
+def _check_platform(backend):
+    # PyOpenGL binds its GL entry points on first import, according to
+    # PYOPENGL_PLATFORM; it cannot be switched afterwards.
+    if 'OpenGL' not in sys.modules:
+        os.environ.setdefault('PYOPENGL_PLATFORM', backend)
+    elif backend == 'osmesa' and os.environ.get('PYOPENGL_PLATFORM') != 'osmesa':
+        raise error.Error("The osmesa backend needs PYOPENGL_PLATFORM=osmesa to be set before OpenGL "
+                          "is first imported. (HINT: export PYOPENGL_PLATFORM=osmesa)")
+
+
+class OffscreenRenderer(object):
+    """Renders a pydart scene without a window or an X display.
+
+    A drop-in replacement for StaticGLUTWindow as DartEnv's viewer: it owns
+    an OpenGLScene (so `scene.tb` camera tweaks keep working) and provides
+    `getFrame`, `getGrayscale`, `runSingleStep` and `close`. Pixels are read
+    into a NumPy buffer allocated once, and grayscale conversion is done in
+    NumPy.
+
+    Backends:
+        egl: a pbuffer surface on an EGL display (GPU nodes, or Mesa's
+          software EGL).
+        osmesa: Mesa's software rasterizer, rendering directly into the
+          NumPy buffer. Requires PYOPENGL_PLATFORM=osmesa.
+
+    Args:
+        sim: the pydart world to render.
+        width, height (int): size of the rendered image.
+        backend (str): one of BACKENDS.
+    """
+
+    def __init__(self, sim, width=640, height=480, backend='egl', title=None):
+        if backend not in BACKENDS:
+            raise error.Error('Unsupported offscreen backend: {}'.format(backend))
+        _check_platform(backend)
+
+        self.sim = sim
+        self.title = title
+        self.backend = backend
+        self.window_size = (width, height)
+        self.rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        self.gray = np.zeros((height, width), dtype=np.uint8)
+        self._scratch = np.zeros((2, height, width), dtype=np.uint32)
+
+        if backend == 'egl':
+            self._create_egl_context(width, height)
+        else:
+            self._create_osmesa_context(width, height)
+
+        from gym.envs.dart import gui
+        gui.load()
+        from pydart2.gui.opengl.scene import OpenGLScene
+        self.scene = OpenGLScene(width, height)
+        self.scene.init()
+        self.scene.resize(width, height)
+
+    def _create_egl_context(self, width, height):
+        from OpenGL import EGL
+        self._egl = EGL
+        self._display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self._display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise error.Error('Could not initialize an EGL display.')
+
+        config_attribs = (EGL.EGLint * 15)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_ALPHA_SIZE, 8, EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE)
+        config = EGL.EGLConfig()
+        num_configs = EGL.EGLint()
+        EGL.eglChooseConfig(self._display, config_attribs, ctypes.pointer(config), 1, ctypes.pointer(num_configs))
+        if num_configs.value < 1:
+            raise error.Error('No EGL config supports offscreen OpenGL rendering.')
+
+        surface_attribs = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+        self._surface = EGL.eglCreatePbufferSurface(self._display, config, surface_attribs)
+        # pydart draws with the fixed-function pipeline: desktop GL, not GLES
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self._context = EGL.eglCreateContext(self._display, config, EGL.EGL_NO_CONTEXT, None)
+        if not self._context:
+            raise error.Error('Could not create an EGL context.')
+        self._make_current()
+
+    def _create_osmesa_context(self, width, height):
+        from OpenGL import osmesa
+        self._osmesa = osmesa
+        self._context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self._context:
+            raise error.Error('Could not create an OSMesa context.')
+        self._make_current()
+
+    def _make_current(self):
+        if self.backend == 'egl':
+            self._egl.eglMakeCurrent(self._display, self._surface, self._surface, self._context)
+        else:
+            from OpenGL import GL
+            w, h = self.window_size
+            self._osmesa.OSMesaMakeCurrent(self._context, self.rgba, GL.GL_UNSIGNED_BYTE, w, h)
+
+    def runSingleStep(self):
+        """Renders the scene into the color buffer."""
+        from OpenGL import GL
+        self._make_current()
+        self.scene.render(self.sim)
+        GL.glFinish()
+
+    def _read_rgba(self):
+        self.runSingleStep()
+        if self.backend == 'egl':
+            from OpenGL import GL
+            w, h = self.window_size
+            GL.glReadPixels(0, 0, w, h, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, self.rgba)
+        # osmesa renders straight into self.rgba
+        return self.rgba
+
+    def getFrame(self):
+        """Returns the rendered (h, w, 3) RGB image, top row first, as a new
+        array like StaticGLUTWindow.getFrame.
+        """
+        return self._read_rgba()[::-1, :, 0:3].copy()
+
+    def getGrayscale(self, _width, _height):
+        """Returns the grayscale image in the (_width, _height) layout of
+        StaticGLUTWindow.getGrayscale, i.e. the bottom-up row-major pixels
+        reshaped to (_width, _height). The array is reused by the next call.
+        """
+        assert (_width, _height) == self.window_size, 'the renderer was created for a different image size'
+        rgba_to_grayscale(self._read_rgba(), self.gray, self._scratch)
+        return self.gray.reshape(_width, _height)
+
+    def close(self):
+        if self._context is None:
+            return
+        if self.backend == 'egl':
+            EGL = self._egl
+            EGL.eglMakeCurrent(self._display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroySurface(self._display, self._surface)
+            EGL.eglDestroyContext(self._display, self._context)
+        else:
+            self._osmesa.OSMesaDestroyContext(self._context)
+        self._context = None
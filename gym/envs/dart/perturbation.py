@@ -0,0 +1,144 @@
+import numpy as np
+
+from gym import error
+from gym.envs.dart.snapshot import find_bodynode
+
+PROFILES = ('constant', 'half_sine')
+
+
+class PushPerturbation(object):
+    """Random external pushes on a skeleton, scheduled per episode.
+
+    At every reset a schedule seed is drawn from the env's seeded
+    `np_random`, and the schedule of the episode (start step, body node and
+    force of each push) is drawn as arrays from it, so a seed replays the
+    same pushes. Steps are control steps, counted from the world frame.
+    `schedule_state()` and `restore_schedule()` carry the schedule through
+    the env's clone_state/restore_state. While no push is active, a step
+    costs one comparison.
+
+    A push starts with probability `probability` at each control step in
+    which no other push is active. It then acts for `duration` control
+    steps, with a magnitude drawn from `magnitude`, along one of `axes` in
+    either direction, on one of `bodies`.
+
+    Args:
+        bodies (list): body node names or indices of the pushed skeleton.
+        probability (float): chance per free control step that a push starts.
+        magnitude (float or (low, high)): force magnitude, in newtons.
+        duration (int): length of a push, in control steps.
+        axes (list): world axes (0, 1, 2) a push may act along.
+        profile (str): 'constant' force, or 'half_sine', which ramps the
+          force up and down over the push.
+        horizon (int): control steps scheduled per draw; longer episodes
+          draw further blocks as they go.
+    """
+
+    def __init__(self, bodies=(2,), probability=0.05, magnitude=5.0, duration=1, axes=(0, 1),
+                 profile='constant', horizon=1000):
+        if profile not in PROFILES:
+            raise error.Error('Unknown push profile {!r}; expected one of {}'.format(profile, PROFILES))
+        self.body_queries = list(bodies)
+        self.probability = probability
+        self.magnitude = (magnitude, magnitude) if np.isscalar(magnitude) else tuple(magnitude)
+        self.duration = int(duration)
+        self.axes = np.array(axes, dtype=int)
+        self.horizon = horizon
+        if profile == 'constant':
+            self.weights = np.ones(self.duration)
+        else:
+            self.weights = np.sin(np.pi * (np.arange(self.duration) + 0.5) / self.duration)
+        self.bodynodes = None
+        self.seed = -1
+        self._clear()
+
+    def bind(self, skel):
+        """Looks up the body nodes of `skel` that can be pushed."""
+        self.bodynodes = [find_bodynode(skel, query) for query in self.body_queries]
+
+    def __getstate__(self):
+        # the settings only: body nodes are looked up again by bind(), and
+        # the schedule is redrawn or restored from its seed
+        state = self.__dict__.copy()
+        for name in ('bodynodes', 'seed', '_rng', 'starts', 'bodies', 'forces', '_scheduled_until',
+                     '_cursor', '_cursor_step'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.bodynodes = None
+        self.seed = -1
+        self._clear()
+
+    def _clear(self):
+        self.starts = np.zeros(0, dtype=int)
+        self.bodies = np.zeros(0, dtype=int)
+        self.forces = np.zeros((0, 3))
+        self._scheduled_until = 0
+        self._cursor = 0
+        self._cursor_step = 0
+
+    def reset(self, np_random):
+        """Draws the schedule of a new episode."""
+        self.restore_schedule(np_random.randint(2**31 - 1), self.horizon)
+
+    def schedule_state(self):
+        """Returns (seed, scheduled horizon) of the current schedule."""
+        return np.array([self.seed, self._scheduled_until], dtype=np.int64)
+
+    def restore_schedule(self, seed, scheduled_until):
+        """Regenerates the schedule drawn from `seed`, up to control step
+        `scheduled_until`. Does nothing if it is the current one."""
+        seed, scheduled_until = int(seed), int(scheduled_until)
+        if seed == self.seed and scheduled_until <= self._scheduled_until:
+            return
+        self.seed = seed
+        self._rng = np.random.RandomState(seed)
+        self._clear()
+        self._schedule_block()
+        while self._scheduled_until < scheduled_until:
+            self._schedule_block()
+
+    def _schedule_block(self):
+        rng = self._rng
+        first = self._scheduled_until
+        candidates = first + np.flatnonzero(rng.uniform(size=self.horizon) < self.probability)
+        n = len(candidates)
+        bodies = rng.randint(len(self.bodynodes), size=n)
+        axes = self.axes[rng.randint(len(self.axes), size=n)]
+        signs = rng.randint(2, size=n) * 2 - 1
+        magnitudes = rng.uniform(self.magnitude[0], self.magnitude[1], size=n)
+
+        # drop the candidates that fall inside an earlier push
+        keep = []
+        free_from = self.starts[-1] + self.duration if len(self.starts) else 0
+        for i, start in enumerate(candidates):
+            if start >= free_from:
+                keep.append(i)
+                free_from = start + self.duration
+        forces = np.zeros((len(keep), 3))
+        forces[np.arange(len(keep)), axes[keep]] = signs[keep] * magnitudes[keep]
+
+        self.starts = np.concatenate([self.starts, candidates[keep]]).astype(int)
+        self.bodies = np.concatenate([self.bodies, bodies[keep]]).astype(int)
+        self.forces = np.concatenate([self.forces, forces])
+        self._scheduled_until = first + self.horizon
+
+    def push(self, step):
+        """Returns (bodynode, force) of the push active at control step
+        `step`, or None."""
+        while step >= self._scheduled_until:
+            self._schedule_block()
+        starts = self.starts
+        if step < self._cursor_step:
+            # moved back in time, e.g. by restore_state
+            self._cursor = np.searchsorted(starts + self.duration, step, side='right')
+        self._cursor_step = step
+        cursor = self._cursor
+        while cursor < len(starts) and starts[cursor] + self.duration <= step:
+            cursor += 1
+        self._cursor = cursor
+        if cursor == len(starts) or starts[cursor] > step:
+            return None
+        return self.bodynodes[self.bodies[cursor]], self.forces[cursor] * self.weights[step - starts[cursor]]
@@ -0,0 +1,149 @@
+import numpy as np
+
+from gym import error
+
+
+def _bodynode_parameter(getter, setter):
+    def read(env, bodynodes):
+        return np.array([getter(bn) for bn in bodynodes])
+
+    def write(env, bodynodes, values, changed):
+        for i in changed:
+            setter(bodynodes[i], values[i])
+    return read, write
+
+
+def _robot_bodynodes(env):
+    return env.robot_skeleton.bodynodes
+
+
+def _ground_bodynodes(env):
+    # every skeleton but the robot, which is always the last one
+    return [bn for skel in env.dart_world.skeletons[:-1] for bn in skel.bodynodes]
+
+
+def _read_damping(env, dofs):
+    return np.array([dof.damping_coefficient() for dof in dofs])
+
+
+def _write_damping(env, dofs, values, changed):
+    for i in changed:
+        dofs[i].set_damping_coefficient(values[i])
+
+
+def _read_actuator_scale(env, _):
+    return env.actuator.scale.copy()
+
+
+def _write_actuator_scale(env, _, values, changed):
+    env.actuator.scale[:] = values
+
+
+# name -> (elements(env), read(env, elements), write(env, elements, values, changed), lower limit)
+# Inertia is only ever scaled, so it needs no limit (and clipping would zero its off-diagonal terms).
+PARAMETERS = {
+    'mass': (_robot_bodynodes,) + _bodynode_parameter(lambda bn: bn.mass(), lambda bn, m: bn.set_mass(m)) + (1e-6,),
+    'inertia': (_robot_bodynodes,) + _bodynode_parameter(lambda bn: np.array(bn.inertia()),
+                                                         lambda bn, I: bn.set_inertia(I)) + (None,),
+    'friction': (_robot_bodynodes,) + _bodynode_parameter(lambda bn: bn.friction_coeff(),
+                                                          lambda bn, f: bn.set_friction_coeff(f)) + (0.0,),
+    'damping': (lambda env: env.robot_skeleton.dofs, _read_damping, _write_damping, 0.0),
+    'actuator_scale': (lambda env: None, _read_actuator_scale, _write_actuator_scale, 0.0),
+    'ground_friction': (_ground_bodynodes,) + _bodynode_parameter(lambda bn: bn.friction_coeff(),
+                                                                 lambda bn, f: bn.set_friction_coeff(f)) + (0.0,),
+}
+
+
+class DomainRandomizer(object):
+    """Randomizes the dynamics parameters of a DartEnv at every reset.
+
+    The nominal values of the randomized parameters are read once, at
+    construction. Each `randomize()` draws the perturbations of all of them
+    with a single call to the env's seeded `np_random`, so the sequence of
+    dynamics is reproducible per seed, and only writes the elements whose
+    value changed back to DART.
+
+    Args:
+        env: the DartEnv to randomize.
+        ranges (dict): parameter name -> (low, high) or (low, high, mode).
+          With mode 'add' (the default) the value is nominal + U(low, high),
+          with 'scale' it is nominal * U(low, high). Values are kept above
+          the parameter's lower limit (zero, or a tiny positive mass).
+
+    Parameters (per element):
+        mass, inertia ('scale' only), friction: the robot's body nodes.
+        damping: the robot's dofs.
+        actuator_scale: the env's actuator torque scale per action
+          dimension (for envs that map actions through `env.actuator`).
+        ground_friction: the body nodes of the other skeletons.
+
+    Example usage:
+
+        env.unwrapped.set_dynamics_randomization({'mass': (0.8, 1.2, 'scale'),
+                                                  'ground_friction': (-0.2, 0.2)})
+    """
+
+    def __init__(self, env, ranges):
+        self.env = env
+        self.ranges = dict(ranges)
+        self.names = sorted(ranges)
+        self.elements, self.nominal, self.values = {}, {}, {}
+        lows, highs, self._slices, self._scaled, self._lower_limits = [], [], {}, {}, {}
+        start = 0
+        for name in self.names:
+            if name not in PARAMETERS:
+                raise error.Error('Unknown dynamics parameter {!r}; expected one of {}'.format(name, sorted(PARAMETERS)))
+            elements, read, _, lower_limit = PARAMETERS[name]
+            spec = ranges[name]
+            mode = spec[2] if len(spec) > 2 else 'add'
+            if mode not in ('add', 'scale') or (name == 'inertia' and mode != 'scale'):
+                raise error.Error('Unsupported randomization mode {!r} for {}'.format(mode, name))
+
+            self.elements[name] = elements(env)
+            self.nominal[name] = read(env, self.elements[name])
+            self.values[name] = self.nominal[name].copy()
+            self._scaled[name] = mode == 'scale'
+            self._lower_limits[name] = lower_limit
+
+            # one draw per element; inertia matrices are scaled as a whole
+            size = len(self.nominal[name])
+            self._slices[name] = slice(start, start + size)
+            start += size
+            lows.append(np.full(size, spec[0], dtype=np.float64))
+            highs.append(np.full(size, spec[1], dtype=np.float64))
+        self._low = np.concatenate(lows) if lows else np.zeros(0)
+        self._high = np.concatenate(highs) if highs else np.zeros(0)
+
+    def randomize(self):
+        """Draws and applies a new set of dynamics parameters."""
+        draws = self.env.np_random.uniform(self._low, self._high)
+        for name in self.names:
+            draw = draws[self._slices[name]]
+            nominal = self.nominal[name]
+            if self._scaled[name]:
+                values = nominal * draw.reshape((-1,) + (1,) * (nominal.ndim - 1))
+            else:
+                values = nominal + draw
+            if self._lower_limits[name] is not None:
+                values = np.maximum(values, self._lower_limits[name])
+            self._apply(name, values)
+
+    def restore_nominal(self):
+        """Puts every randomized parameter back to its nominal value."""
+        for name in self.names:
+            self._apply(name, self.nominal[name])
+
+    def set_values(self, values):
+        """Applies `values` (parameter name -> values), e.g. the `values`
+        of a randomizer with the same ranges in another process."""
+        for name in self.names:
+            self._apply(name, np.asarray(values[name]))
+
+    def _apply(self, name, values):
+        current = self.values[name]
+        if not len(current):
+            return
+        changed = np.flatnonzero((values != current).reshape(len(current), -1).any(axis=1))
+        if len(changed):
+            PARAMETERS[name][2](self.env, self.elements[name], values, changed)
+            self.values[name] = values
@@ -3,35 +3,45 @@
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment, FeatureSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 
 class DartReacherEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('target',)
+
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.target = np.array([0.8, -0.6, 0.6])
         self.action_scale = np.array([10, 10, 10, 10, 10])
         self.control_bounds = np.array([[1.0, 1.0, 1.0, 1.0, 1.0],[-1.0, -1.0, -1.0, -1.0, -1.0]])
-        dart_env.DartEnv.__init__(self, 'reacher.skel', 4, 21, self.control_bounds)
-        utils.EzPickle.__init__(self)
+        dart_env.DartEnv.__init__(self, 'reacher.skel', 4, 21, self.control_bounds, disableViewer=disableViewer, render_backend=render_backend)
+
+        # the fingertip is at `fingertip` in the frame of body node 2
+        self.fingertip = np.array([0.0, -0.25, 0.0])
+        self._vec = np.zeros(3)
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [2])
+        ndofs = self.robot_skeleton.ndofs
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            FeatureSegment(ndofs, self._cos_q),
+            FeatureSegment(ndofs, self._sin_q),
+            FeatureSegment(3, self._target),
+            StateSegment('dq'),
+            FeatureSegment(3, self._fingertip_to_target),
+        ])
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def step(self, a):
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.multiply(clamped_control, self.action_scale)
-
-        fingertip = np.array([0.0, -0.25, 0.0])
-        vec = self.robot_skeleton.bodynodes[2].to_world(fingertip) - self.target
-        reward_dist = - np.linalg.norm(vec)
+        tau = self.actuator.torques(a)
+
+        reward_dist = - np.linalg.norm(self._fingertip_vector())
         reward_ctrl = - np.square(tau).sum() * 0.001
         alive_bonus = 0
         reward = reward_dist + reward_ctrl + alive_bonus
         
         self.do_simulation(tau, self.frame_skip)
+        self.snapshot.update()
         ob = self._get_obs()
 
-        s = self.state_vector()
+        s = self.snapshot.x
 
         done = not (np.isfinite(s).all() and (-reward_dist > 0.1))
 
@@ -39,10 +49,27 @@ class DartReacherEnv(dart_env.DartEnv, utils.EzPickle):
         return ob, reward, done, {}
 
     def _get_obs(self):
-        theta = self.robot_skeleton.q
-        fingertip = np.array([0.0, -0.25, 0.0])
-        vec = self.robot_skeleton.bodynodes[2].to_world(fingertip) - self.target
-        return np.concatenate([np.cos(theta), np.sin(theta), self.target, self.robot_skeleton.dq, vec]).ravel()
+        return self.observation_layout.fill()
+
+    def _cos_q(self, out):
+        np.cos(self.snapshot.q, out=out)
+
+    def _sin_q(self, out):
+        np.sin(self.snapshot.q, out=out)
+
+    def _target(self, out):
+        out[:] = self.target
+
+    def _fingertip_to_target(self, out):
+        out[:] = self._fingertip_vector()
+
+    def _fingertip_vector(self):
+        # bodynodes[2].to_world(self.fingertip) - self.target, from the snapshot
+        T = self.snapshot.transform(2)
+        vec = np.dot(T[:3, :3], self.fingertip, out=self._vec)
+        vec += T[:3, 3]
+        vec -= self.target
+        return vec
 
     def reset_model(self):
         self.dart_world.reset()
@@ -3,25 +3,21 @@ from gym import utils
 from gym.envs.dart import dart_env
 
 class DartReacher2dEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('target',)
+
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.target = np.array([0.1, 0.01, -0.1])
         self.action_scale = np.array([200, 200])
         self.control_bounds = np.array([[1.0, 1.0],[-1.0, -1.0]])
-        dart_env.DartEnv.__init__(self, 'reacher2d.skel', 2, 11, self.control_bounds, dt=0.01, disableViewer=False)
+        dart_env.DartEnv.__init__(self, 'reacher2d.skel', 2, 11, self.control_bounds, dt=0.01, disableViewer=disableViewer, render_backend=render_backend)
         for s in self.dart_world.skeletons:
             s.set_self_collision_check(False)
             for n in s.bodynodes:
                 n.set_collidable(False)
-        utils.EzPickle.__init__(self)
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def step(self, a):
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.multiply(clamped_control, self.action_scale)
+        tau = self.actuator.torques(a)
 
         self.do_simulation(tau, self.frame_skip)
         ob = self._get_obs()
@@ -0,0 +1,45 @@
+import copy
+import xml.etree.ElementTree as ET
+
+
+def replicate_skel(fullpath, copies, lane_width):
+    """Returns the ElementTree of the .skel world file `fullpath` with its
+    last skeleton, the robot, replaced by `copies` copies of it.
+
+    pydart2 can only add .urdf, .sdf and .vsk skeletons to a world, so the
+    copies are written into the world file itself. Copy k is named
+    '<robot>_<k>' and moved `lane_width` apart from its neighbours along the
+    z axis, and the box shapes of the other skeletons (the ground) are
+    widened along z to span every lane. For planar models, which move in
+    the x-y plane, this keeps the copies from ever touching each other while
+    each sees the same ground. Relative mesh paths are not supported, as the
+    file is written to a temporary directory.
+    """
+    tree = ET.parse(fullpath)
+    world = tree.getroot().find('world')
+    skeletons = world.findall('skeleton')
+    robot = skeletons[-1]
+    world.remove(robot)
+
+    span = (copies - 1) * lane_width
+    for skel in skeletons[:-1]:
+        for box in skel.iter('box'):
+            size = box.find('size')
+            values = [float(v) for v in size.text.split()]
+            values[2] += span
+            size.text = ' '.join(repr(v) for v in values)
+
+    name = robot.get('name')
+    for k in range(copies):
+        replica = copy.deepcopy(robot)
+        replica.set('name', '{}_{}'.format(name, k))
+        transformation = replica.find('transformation')
+        if transformation is None:
+            transformation = ET.Element('transformation')
+            transformation.text = '0 0 0 0 0 0'
+            replica.insert(0, transformation)
+        values = [float(v) for v in transformation.text.split()]
+        values[2] += k * lane_width - span / 2.0
+        transformation.text = ' '.join(repr(v) for v in values)
+        world.append(replica)
+    return tree
@@ -0,0 +1,75 @@
+import numpy as np
+import pydart2.pydart2_api as papi
+import six
+
+
+def find_bodynode(skel, query):
+    """Returns the body node of `skel` named `query`, or with index
+    `query`. pydart2's `Skeleton.bodynode` only handles names: its integer
+    branch reads a `bodies` attribute that skeletons do not have."""
+    if isinstance(query, six.string_types):
+        return skel.bodynode(query)
+    return skel.bodynodes[int(query)]
+
+
+class SkeletonSnapshot(object):
+    """Kinematic state of one skeleton, read from DART once per step.
+
+    Every pydart property access (`skel.q`, `bn.com()`, `bn.to_world(...)`,
+    `skel.q_lower`, ...) copies data out of C++, and `skel.q` also builds a
+    SkelVector. Reward, termination and observation code that reads the same
+    quantities several times per step can instead call `update()` once after
+    the simulation and read everything from the arrays below.
+
+    Args:
+        skel: the pydart skeleton.
+        bodynodes (list): names (or indices) of the body nodes whose COM and
+          world transform are tracked. Their handles are looked up once, here.
+
+    Attributes:
+        x: (2 * ndofs,) positions followed by velocities, i.e. the state
+          vector. `q` and `dq` are views into it.
+        q_lower, q_upper: joint position limits, read once at construction.
+        coms: (n, 3) COM positions of the tracked body nodes.
+        transforms: (n, 4, 4) world transforms of the tracked body nodes.
+        bodynodes (dict): name -> handle of the tracked body nodes.
+    """
+
+    def __init__(self, skel, bodynodes=()):
+        self.skel = skel
+        ndofs = skel.ndofs
+        self._wid, self._skid, self._ndofs = skel.world.id, skel.id, ndofs
+
+        self.x = np.zeros(2 * ndofs)
+        self.q = self.x[:ndofs]
+        self.dq = self.x[ndofs:]
+        self.q_lower = np.array(skel.q_lower)
+        self.q_upper = np.array(skel.q_upper)
+
+        self.names = list(bodynodes)
+        self.bodynodes = dict((name, find_bodynode(skel, name)) for name in self.names)
+        self._index = dict((name, i) for i, name in enumerate(self.names))
+        self._bns = [self.bodynodes[name] for name in self.names]
+        self.coms = np.zeros((len(self.names), 3))
+        self.transforms = np.zeros((len(self.names), 4, 4))
+
+    def update(self):
+        """Reads the current state from DART. Returns self."""
+        wid, skid, ndofs = self._wid, self._skid, self._ndofs
+        self.q[:] = papi.skeleton__getPositions(wid, skid, ndofs)
+        self.dq[:] = papi.skeleton__getVelocities(wid, skid, ndofs)
+        for i, bn in enumerate(self._bns):
+            self.coms[i] = bn.com()
+            self.transforms[i] = bn.T
+        return self
+
+    def com(self, name):
+        return self.coms[self._index[name]]
+
+    def transform(self, name):
+        return self.transforms[self._index[name]]
+
+    def axis(self, name, axis):
+        """Unit vector, in world coordinates, of local axis `axis` (0, 1 or 2)
+        of a tracked body node."""
+        return self.transforms[self._index[name], :3, axis]
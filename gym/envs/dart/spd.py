@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class SPDController(object):
+    """Stable proportional-derivative control (Tan, Liu and Turk, 2011).
+
+    Computes the torque that drives `skel` towards `target_q` using the
+    next-step position estimate q + dq * dt, which stays stable for gains
+    and time steps where plain PD control diverges:
+
+        qddot = (M + Kd dt)^-1 (-c + p + d + constraint forces)
+        tau   = p + d - Kd qddot dt
+
+    The gains are diagonal and kept as vectors. The linear system is solved
+    with `np.linalg.solve` rather than by forming the inverse, and all
+    intermediate vectors live in scratch buffers owned by the controller.
+
+    Args:
+        skel: the pydart skeleton to control.
+        kp, kd (array): per-dof proportional and derivative gains.
+        dt (float): the look-ahead time step.
+        torque_limit (Optional[float or array]): symmetric bound on the
+          actuated torques.
+        actuated_dofs (Optional[slice]): dofs that may receive torque; the
+          others (typically the root joint) are zeroed. Defaults to all dofs.
+    """
+
+    def __init__(self, skel, kp, kd, dt, torque_limit=None, actuated_dofs=None):
+        self.skel = skel
+        ndofs = skel.ndofs
+        self.kp = np.ones(ndofs) * kp
+        self.kd = np.ones(ndofs) * kd
+        self.dt = dt
+        self.dofs = slice(0, ndofs) if actuated_dofs is None else actuated_dofs
+        self.torque_limit = None if torque_limit is None else np.array(torque_limit, dtype=np.float64)
+
+        self._kd_dt = self.kd * dt
+        self._A = np.empty((ndofs, ndofs))
+        self._p = np.empty(ndofs)
+        self._d = np.empty(ndofs)
+        self._rhs = np.empty(ndofs)
+        self._tau = np.empty(ndofs)
+        self._passive = np.ones(ndofs, dtype=bool)
+        self._passive[self.dofs] = False
+
+    def compute(self, target_q):
+        """Returns the SPD torque for `target_q`. The returned array is reused
+        by the next call.
+        """
+        skel = self.skel
+        q = np.asarray(skel.q)
+        dq = np.asarray(skel.dq)
+        p, d, rhs, tau = self._p, self._d, self._rhs, self._tau
+
+        # p = -Kp (q + dq dt - target_q),  d = -Kd dq
+        np.multiply(dq, self.dt, out=p)
+        p += q
+        p -= target_q
+        p *= -self.kp
+        np.multiply(dq, -self.kd, out=d)
+
+        A = self._A
+        np.copyto(A, skel.M)
+        A.flat[::A.shape[0] + 1] += self._kd_dt
+
+        np.subtract(p, skel.c, out=rhs)
+        rhs += d
+        rhs += skel.constraint_forces()
+        qddot = np.linalg.solve(A, rhs)
+
+        np.multiply(qddot, self._kd_dt, out=tau)
+        np.subtract(p, tau, out=tau)
+        tau += d
+        tau[self._passive] = 0
+        if self.torque_limit is not None:
+            actuated = tau[self.dofs]
+            np.clip(actuated, -self.torque_limit, self.torque_limit, out=actuated)
+        return tau
@@ -7,6 +7,7 @@ import sys
 import numpy as np
 from pydart2.gui.opengl.scene import OpenGLScene
 from pydart2.gui.glut.window import *
+from gym.envs.dart.offscreen import rgba_to_grayscale
 
 
 class StaticGLUTWindow(GLUTWindow):
@@ -27,14 +28,17 @@ class StaticGLUTWindow(GLUTWindow):
         # for end to end learning
         # Do not call it in other case
         # there will be some potential problems
-        from PIL import Image
-        data = GL.glReadPixels(0, 0,
-                               _width, _height,
-                               GL.GL_RGBA,
-                               GL.GL_UNSIGNED_BYTE)
-        img = Image.frombytes("RGBA", (_width, _height), data).convert('L')
-        img = np.array(img.getdata(), dtype=np.uint8)
-        return img.reshape(_width, _height)
+        if getattr(self, '_rgba', None) is None or self._rgba.shape != (_height, _width, 4):
+            self._rgba = np.zeros((_height, _width, 4), dtype=np.uint8)
+            self._gray = np.zeros((_height, _width), dtype=np.uint8)
+            self._gray_scratch = np.zeros((2, _height, _width), dtype=np.uint32)
+        GL.glReadPixels(0, 0,
+                        _width, _height,
+                        GL.GL_RGBA,
+                        GL.GL_UNSIGNED_BYTE,
+                        self._rgba)
+        rgba_to_grayscale(self._rgba, self._gray, self._gray_scratch)
+        return self._gray.reshape(_width, _height)
 
     def getFrame(self):
         self.runSingleStep()
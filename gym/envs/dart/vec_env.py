@@ -0,0 +1,41 @@
+from functools import partial
+
+import gym
+from gym.vector import SubprocVecEnv
+
+
+class DartVecEnv(SubprocVecEnv):
+    """Runs `num_envs` copies of a registered DART environment (for example
+    'DartWalker3d-v1' or 'DartHumanWalker-v1'), one per worker process, and
+    steps them as a batch.
+
+    Each worker builds its env with `gym.make(env_id, **kwargs)`, so registry
+    kwargs and the TimeLimit wrapper apply as usual and extra keyword
+    arguments (e.g. `disableViewer=True`) override the registered ones.
+    Sub-environment `i` is seeded through `DartEnv.seed`; `seed(s)` seeds
+    it with `s + i`.
+
+    Example usage:
+
+        venv = DartVecEnv('DartHopper-v1', 8)
+        venv.seed(0)
+        obs = venv.reset()                         # shape (8, 11)
+        obs, rewards, dones, infos = venv.step(actions)
+
+    With many workers, pass `threads=1` so that the BLAS calls of the
+    envs (e.g. the SPD controller's matrix inverse) do not each start a
+    thread per core, and `placement` to pin the workers, see
+    SubprocVecEnv. Workers start faster from a pre-warmed fork server (see
+    gym.vector.worker_factory):
+
+        ctx = forkserver_context(['gym.envs.dart'], ['DartHopper-v1'])
+        venv = DartVecEnv('DartHopper-v1', 8, context=ctx)
+    """
+
+    def __init__(self, env_id, num_envs, context=None, copy=True, placement=None, threads=None, **kwargs):
+        self.env_id = env_id
+        env_fns = [partial(gym.make, env_id, **kwargs) for _ in range(num_envs)]
+        SubprocVecEnv.__init__(self, env_fns, context=context, copy=copy, placement=placement, threads=threads)
+
+    def __str__(self):
+        return '<{}<{}>({})>'.format(type(self).__name__, self.env_id, self.num_envs)
@@ -1,44 +1,37 @@
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment, FeatureSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 
 
 class DartWalker2dEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.control_bounds = np.array([[1.0]*6,[-1.0]*6])
         self.action_scale = np.array([100, 100, 20, 100, 100, 20])
         obs_dim = 17
 
-        dart_env.DartEnv.__init__(self, 'walker2d.skel', 4, obs_dim, self.control_bounds, disableViewer=False)
+        dart_env.DartEnv.__init__(self, 'walker2d.skel', 4, obs_dim, self.control_bounds, disableViewer=disableViewer, render_backend=render_backend)
 
-        try:
-            self.dart_world.set_collision_detector(3)
-        except Exception as e:
-            print('Does not have ODE collision detector, reverted to bullet collision detector')
-            self.dart_world.set_collision_detector(2)
+        self.configure_collision(detector=('ode', 'bullet'))
 
-        utils.EzPickle.__init__(self)
+        # the height of the torso (body node 2) replaces the root x position
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [2])
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            FeatureSegment(1, self._torso_height),
+            StateSegment('q', slice(2, None)),
+            StateSegment('dq', clip=(-10, 10)),
+        ])
+
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def step(self, a):
-        pre_state = [self.state_vector()]
-
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.zeros(self.robot_skeleton.ndofs)
-        tau[3:] = clamped_control * self.action_scale
+        tau = self.actuator.torques(a)
         posbefore = self.robot_skeleton.q[0]
         self.do_simulation(tau, self.frame_skip)
-        posafter,ang = self.robot_skeleton.q[0,2]
-        height = self.robot_skeleton.bodynodes[2].com()[1]
-
-        contacts = self.dart_world.collision_result.contacts
-        total_force_mag = 0
-        for contact in contacts:
-            total_force_mag += np.square(contact.force).sum()
+        snap = self.snapshot.update()
+        posafter, ang = snap.q[0], snap.q[2]
+        height = snap.com(2)[1]
 
         alive_bonus = 1.0
         vel = (posafter - posbefore) / self.dt
@@ -56,7 +49,7 @@ class DartWalker2dEnv(dart_env.DartEnv, utils.EzPickle):
 
         reward -= 5e-1 * joint_limit_penalty'''
 
-        s = self.state_vector()
+        s = snap.x
         done = not (np.isfinite(s).all() and (np.abs(s[2:]) < 100).all() and
                     (height > .8) and (height < 2.0) and (abs(ang) < 1.0))
 
@@ -65,13 +58,10 @@ class DartWalker2dEnv(dart_env.DartEnv, utils.EzPickle):
         return ob, reward, done, {}
 
     def _get_obs(self):
-        state =  np.concatenate([
-            self.robot_skeleton.q[1:],
-            np.clip(self.robot_skeleton.dq,-10,10)
-        ])
-        state[0] = self.robot_skeleton.bodynodes[2].com()[1]
+        return self.observation_layout.fill()
 
-        return state
+    def _torso_height(self, out):
+        out[0] = self.snapshot.com(2)[1]
 
     def reset_model(self):
         self.dart_world.reset()
@@ -3,10 +3,14 @@ __author__ = 'yuwenhao'
 import numpy as np
 from gym import utils
 from gym.envs.dart import dart_env
+from gym.envs.dart.observation import ObservationLayout, StateSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 
 
 class DartWalker3dEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('t',)
+
+    def __init__(self, disableViewer=False, render_backend='glut'):
         self.control_bounds = np.array([[1.0]*15,[-1.0]*15])
         self.action_scale = np.array([100.0]*15)
         self.action_scale[[-1,-2,-7,-8]] = 20
@@ -15,30 +19,25 @@ class DartWalker3dEnv(dart_env.DartEnv, utils.EzPickle):
 
         self.t = 0
 
-        dart_env.DartEnv.__init__(self, 'walker3d_waist.skel', 4, obs_dim, self.control_bounds, disableViewer=False)
+        dart_env.DartEnv.__init__(self, 'walker3d_waist.skel', 4, obs_dim, self.control_bounds, disableViewer=disableViewer, render_backend=render_backend)
 
-        try:
-            self.dart_world.set_collision_detector(3)
-        except Exception as e:
-            print('Does not have ODE collision detector, reverted to bullet collision detector')
-            self.dart_world.set_collision_detector(2)
+        # adjacent links are not checked against each other (DART's default)
+        self.configure_collision(detector=('ode', 'bullet'), self_collision=True)
 
-        self.robot_skeleton.set_self_collision_check(True)
+        # the torso (body node 0) drives the reward and termination terms
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [0])
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            StateSegment('q', slice(1, None)),
+            StateSegment('dq', clip=(-10, 10)),
+        ])
 
         for i in range(1, len(self.dart_world.skeletons[0].bodynodes)):
             self.dart_world.skeletons[0].bodynodes[i].set_friction_coeff(0)
 
-        utils.EzPickle.__init__(self)
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def advance(self, a):
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
-        tau = np.zeros(self.robot_skeleton.ndofs)
-        tau[6:] = clamped_control * self.action_scale
+        tau = self.actuator.torques(a)
 
         self.do_simulation(tau, self.frame_skip)
 
@@ -46,32 +45,20 @@ class DartWalker3dEnv(dart_env.DartEnv, utils.EzPickle):
         posbefore = self.robot_skeleton.bodynodes[0].com()[0]
         self.advance(a)
 
-        posafter = self.robot_skeleton.bodynodes[0].com()[0]
-        height = self.robot_skeleton.bodynodes[0].com()[1]
-        side_deviation = self.robot_skeleton.bodynodes[0].com()[2]
-
-        upward = np.array([0, 1, 0])
-        upward_world = self.robot_skeleton.bodynodes[0].to_world(np.array([0, 1, 0])) - self.robot_skeleton.bodynodes[0].to_world(np.array([0, 0, 0]))
-        upward_world /= np.linalg.norm(upward_world)
-        ang_cos_uwd = np.dot(upward, upward_world)
-        ang_cos_uwd = np.arccos(ang_cos_uwd)
+        snap = self.snapshot.update()
+        posafter, height, side_deviation = snap.com(0)
 
-        forward = np.array([1, 0, 0])
-        forward_world = self.robot_skeleton.bodynodes[0].to_world(np.array([1, 0, 0])) - self.robot_skeleton.bodynodes[0].to_world(np.array([0, 0, 0]))
-        forward_world /= np.linalg.norm(forward_world)
-        ang_cos_fwd = np.dot(forward, forward_world)
-        ang_cos_fwd = np.arccos(ang_cos_fwd)
+        upward_world = snap.axis(0, 1) / np.linalg.norm(snap.axis(0, 1))
+        ang_cos_uwd = np.arccos(upward_world[1])
 
-        contacts = self.dart_world.collision_result.contacts
-        total_force_mag = 0
-        for contact in contacts:
-            total_force_mag += np.square(contact.force).sum()
+        forward_world = snap.axis(0, 0) / np.linalg.norm(snap.axis(0, 0))
+        ang_cos_fwd = np.arccos(forward_world[0])
 
         joint_limit_penalty = 0
         for j in [-3, -9]:
-            if (self.robot_skeleton.q_lower[j] - self.robot_skeleton.q[j]) > -0.05:
+            if (snap.q_lower[j] - snap.q[j]) > -0.05:
                 joint_limit_penalty += abs(1.5)
-            if (self.robot_skeleton.q_upper[j] - self.robot_skeleton.q[j]) < 0.05:
+            if (snap.q_upper[j] - snap.q[j]) < 0.05:
                 joint_limit_penalty += abs(1.5)
 
         alive_bonus = 1.0
@@ -84,7 +71,7 @@ class DartWalker3dEnv(dart_env.DartEnv, utils.EzPickle):
 
         self.t += self.dt
 
-        s = self.state_vector()
+        s = snap.x
         done = not (np.isfinite(s).all() and (np.abs(s[2:]) < 100).all() and
                     (height > 1.05) and (height < 2.0) and (abs(ang_cos_uwd) < 0.84) and (abs(ang_cos_fwd) < 0.84))
 
@@ -96,12 +83,7 @@ class DartWalker3dEnv(dart_env.DartEnv, utils.EzPickle):
         return ob, reward, done, {}
 
     def _get_obs(self):
-        state =  np.concatenate([
-            self.robot_skeleton.q[1:],
-            np.clip(self.robot_skeleton.dq,-10,10),
-        ])
-
-        return state
+        return self.observation_layout.fill()
 
     def reset_model(self):
         self.dart_world.reset()
@@ -3,19 +3,24 @@ __author__ = 'yuwenhao'
 import numpy as np
 from gym import utils, spaces
 from gym.envs.dart import dart_env
+from gym.envs.dart.spd import SPDController
+from gym.envs.dart.observation import ObservationLayout, StateSegment
+from gym.envs.dart.snapshot import SkeletonSnapshot
 
 # 3d Walker with SPD as action space
 # NOTE: SPD parameters haven't been tuned
 class DartWalker3dSPDEnv(dart_env.DartEnv, utils.EzPickle):
-    def __init__(self):
+    state_fields = dart_env.DartEnv.state_fields + ('t',)
+
+    def __init__(self, disableViewer=True, render_backend='glut'):
         self.control_bounds = np.array([[1.0]*15,[-1.0]*15])
 
         kp_diag = np.array([0.0] * 6 + [100.0] * (15))
         kp_diag[0:3] = 300
         kp_diag[7:9] = 30
         kp_diag[13:15] = 30
-        self.Kp = np.diagflat(kp_diag)
-        self.Kd = np.diagflat(kp_diag / 10.0)
+        self.kp_diag = kp_diag
+        self.kd_diag = kp_diag / 10.0
 
         self.torque_limit = np.array([200] * 15)
         self.torque_limit[[-1,-2,-7,-8]] = 20
@@ -25,29 +30,29 @@ class DartWalker3dSPDEnv(dart_env.DartEnv, utils.EzPickle):
 
         self.t = 0
 
-        dart_env.DartEnv.__init__(self, 'walker3d_waist.skel', 4, obs_dim, self.control_bounds, disableViewer=True)
+        dart_env.DartEnv.__init__(self, 'walker3d_waist.skel', 4, obs_dim, self.control_bounds, disableViewer=disableViewer, render_backend=render_backend)
+
+        # adjacent links are not checked against each other (DART's default)
+        self.configure_collision(detector=('ode', 'bullet'), self_collision=True)
 
-        try:
-            self.dart_world.set_collision_detector(3)
-        except Exception as e:
-            print('Does not have ODE collision detector, reverted to bullet collision detector')
-            self.dart_world.set_collision_detector(2)
+        self.spd = SPDController(self.robot_skeleton, self.kp_diag, self.kd_diag, self.dt,
+                                 torque_limit=self.torque_limit, actuated_dofs=self.actuator.dofs)
+        # the torso (body node 0) drives the reward and termination terms
+        self.snapshot = SkeletonSnapshot(self.robot_skeleton, [0])
+        self.observation_layout = ObservationLayout(self.snapshot, [
+            StateSegment('q', slice(1, None)),
+            StateSegment('dq', clip=(-10, 10)),
+        ])
 
-        self.robot_skeleton.set_self_collision_check(True)
+        # joint limits are fixed, so the action -> target pose map is too
+        self.target_q = np.zeros(self.robot_skeleton.ndofs)
+        self.target_lower = self.snapshot.q_lower[self.actuator.dofs]
+        self.target_range = self.snapshot.q_upper[self.actuator.dofs] - self.target_lower
 
-        utils.EzPickle.__init__(self)
+        utils.EzPickle.__init__(self, disableViewer, render_backend)
 
     def _spd(self, target_q):
-        invM = np.linalg.inv(self.robot_skeleton.M + self.Kd * self.dt)
-        p = -self.Kp.dot(self.robot_skeleton.q + self.robot_skeleton.dq * self.dt - target_q)
-        d = -self.Kd.dot(self.robot_skeleton.dq)
-        qddot = invM.dot(-self.robot_skeleton.c + p + d + self.robot_skeleton.constraint_forces())
-        tau = p + d - self.Kd.dot(qddot) * self.dt
-        tau[0:6] = 0
-        for i in range(len(self.torque_limit)):
-            if abs(tau[i+6]) > self.torque_limit[i]:
-                tau[i+6] = np.sign(tau[i+6]) * self.torque_limit[i]
-        return tau
+        return self.spd.compute(target_q)
 
     def do_simulation_spd(self, target, n_frames):
         for i in range(n_frames):
@@ -57,45 +62,27 @@ class DartWalker3dSPDEnv(dart_env.DartEnv, utils.EzPickle):
     def step(self, a):
         pre_state = [self.state_vector()]
 
-        clamped_control = np.array(a)
-        for i in range(len(clamped_control)):
-            if clamped_control[i] > self.control_bounds[0][i]:
-                clamped_control[i] = self.control_bounds[0][i]
-            if clamped_control[i] < self.control_bounds[1][i]:
-                clamped_control[i] = self.control_bounds[1][i]
+        clamped_control = self.actuator.clip(a)
 
-        target_q = np.zeros(self.robot_skeleton.ndofs)
-        for i in range(len(self.control_bounds[0])):
-            target_q[6 + i] = (clamped_control[i] + 1.0) / 2.0 * (self.robot_skeleton.q_upper[i+6] - self.robot_skeleton.q_lower[i+6]) + self.robot_skeleton.q_lower[i+6]
+        target_q = self.target_q
+        target_q[self.actuator.dofs] = (clamped_control + 1.0) / 2.0 * self.target_range + self.target_lower
 
         posbefore = self.robot_skeleton.bodynodes[0].com()[0]
         self.do_simulation_spd(target_q, self.frame_skip)
-        posafter = self.robot_skeleton.bodynodes[0].com()[0]
-        height = self.robot_skeleton.bodynodes[0].com()[1]
-        side_deviation = self.robot_skeleton.bodynodes[0].com()[2]
-
-        upward = np.array([0, 1, 0])
-        upward_world = self.robot_skeleton.bodynodes[0].to_world(np.array([0, 1, 0])) - self.robot_skeleton.bodynodes[0].to_world(np.array([0, 0, 0]))
-        upward_world /= np.linalg.norm(upward_world)
-        ang_cos_uwd = np.dot(upward, upward_world)
-        ang_cos_uwd = np.arccos(ang_cos_uwd)
-
-        forward = np.array([1, 0, 0])
-        forward_world = self.robot_skeleton.bodynodes[0].to_world(np.array([1, 0, 0])) - self.robot_skeleton.bodynodes[0].to_world(np.array([0, 0, 0]))
-        forward_world /= np.linalg.norm(forward_world)
-        ang_cos_fwd = np.dot(forward, forward_world)
-        ang_cos_fwd = np.arccos(ang_cos_fwd)
-
-        contacts = self.dart_world.collision_result.contacts
-        total_force_mag = 0
-        for contact in contacts:
-            total_force_mag += np.square(contact.force).sum()
+        snap = self.snapshot.update()
+        posafter, height, side_deviation = snap.com(0)
+
+        upward_world = snap.axis(0, 1) / np.linalg.norm(snap.axis(0, 1))
+        ang_cos_uwd = np.arccos(upward_world[1])
+
+        forward_world = snap.axis(0, 0) / np.linalg.norm(snap.axis(0, 0))
+        ang_cos_fwd = np.arccos(forward_world[0])
 
         joint_limit_penalty = 0
         for j in [-3, -9]:
-            if (self.robot_skeleton.q_lower[j] - self.robot_skeleton.q[j]) > -0.05:
+            if (snap.q_lower[j] - snap.q[j]) > -0.05:
                 joint_limit_penalty += abs(1.5)
-            if (self.robot_skeleton.q_upper[j] - self.robot_skeleton.q[j]) < 0.05:
+            if (snap.q_upper[j] - snap.q[j]) < 0.05:
                 joint_limit_penalty += abs(1.5)
 
         alive_bonus = 1.0
@@ -104,11 +91,11 @@ class DartWalker3dSPDEnv(dart_env.DartEnv, utils.EzPickle):
         #joint_pen = 5e-1 * joint_limit_penalty
         deviation_pen = 1e-1 * abs(side_deviation)
         reward = vel_rew + alive_bonus - action_pen - deviation_pen
-        #reward -= 1e-7 * total_force_mag
+        #reward -= 1e-7 * self.contacts.total_force_sq()
 
         self.t += self.dt
 
-        s = self.state_vector()
+        s = snap.x
         done = not (np.isfinite(s).all() and (np.abs(s[2:]) < 100).all() and
                     (height > 1.05) and (height < 2.0) and (abs(ang_cos_uwd) < 0.54) and (abs(ang_cos_fwd) < 0.54))
 
@@ -117,12 +104,7 @@ class DartWalker3dSPDEnv(dart_env.DartEnv, utils.EzPickle):
         return ob, reward, done, {'pre_state':pre_state, 'vel_rew':vel_rew, 'action_pen':action_pen, 'deviation_pen':deviation_pen, 'done_return':done}
 
     def _get_obs(self):
-        state = np.concatenate([
-            self.robot_skeleton.q[1:],
-            np.clip(self.robot_skeleton.dq, -10, 10),
-        ])
-
-        return state
+        return self.observation_layout.fill()
 
     def reset_model(self):
         self.dart_world.reset()
@@ -0,0 +1,110 @@
+import atexit
+import os
+import tempfile
+from os import path
+
+from gym import error
+from gym.envs.dart.dart_world import DartWorld
+from gym.envs.dart.replicate import replicate_skel
+
+_builders = {}
+
+
+class WorldBuilder(object):
+    """Builds the DartWorlds of a given set of model files, remembering
+    per process what it has worked out about them.
+
+    This is a memo of paths and metadata, not a cache of parsed worlds:
+    pydart2 can only load a world from its model files and cannot copy
+    one, so every `build_world` has DART parse the files again. What is
+    kept is the resolved asset paths, with their modification times, and,
+    once the first world has been built, the joints of the robot skeleton
+    that have position limits, so later worlds skip the walk over every
+    joint and dof. The files are still stat'ed for every new env (see
+    `is_stale`), so an edited file is picked up.
+
+    With `copies` > 1 the world holds that many copies of the robot (the
+    last skeleton of a .skel world file), see `replicate.replicate_skel`. They are
+    the last `copies` skeletons of the world.
+    """
+
+    def __init__(self, full_paths, dt, copies=1, lane_width=1.0):
+        self.full_paths = full_paths
+        self.mtimes = [os.stat(p).st_mtime for p in full_paths]
+        self.dt = dt
+        self.copies = copies
+        self.lane_width = lane_width
+        self.limited_joints = None
+        self.replicated_path = None
+        if copies > 1:
+            if len(full_paths) != 1 or full_paths[0][-5:] != '.skel':
+                raise error.Error('Replicated worlds need a single .skel world file, got {}'.format(full_paths))
+            fd, self.replicated_path = tempfile.mkstemp(suffix='.skel', prefix='replicated_')
+            with os.fdopen(fd, 'wb') as f:
+                replicate_skel(full_paths[0], copies, lane_width).write(f)
+            atexit.register(self.remove_replicated)
+
+    def remove_replicated(self):
+        if self.replicated_path is not None and path.exists(self.replicated_path):
+            os.remove(self.replicated_path)
+
+    def is_stale(self):
+        try:
+            return any(os.stat(p).st_mtime != mtime for p, mtime in zip(self.full_paths, self.mtimes))
+        except OSError:
+            return True
+
+    def build_world(self, record=True):
+        if self.replicated_path is not None:
+            world = DartWorld(self.dt, self.replicated_path, record=record)
+        elif self.full_paths[0][-5:] == '.skel':
+            world = DartWorld(self.dt, self.full_paths[0], record=record)
+        else:
+            world = DartWorld(self.dt, record=record)
+            for fullpath in self.full_paths:
+                world.add_skeleton(fullpath)
+
+        # the skeleton of interest is always the last one (or the last copies)
+        joints = world.skeletons[-1].joints
+        if self.limited_joints is None:
+            self.limited_joints = [jt for jt in range(len(joints))
+                                   if any(joints[jt].has_position_limit(dof) for dof in range(len(joints[jt].dofs)))]
+        for skel in world.skeletons[-self.copies:]:
+            for jt in self.limited_joints:
+                skel.joints[jt].set_position_limit_enforced(True)
+        return world
+
+
+def resolve_model_paths(model_paths):
+    """Returns the full paths of `model_paths`; relative paths refer to the
+    dart assets directory."""
+    full_paths = []
+    for model_path in model_paths:
+        if model_path.startswith("/"):
+            fullpath = model_path
+        else:
+            fullpath = os.path.join(os.path.dirname(__file__), "assets", model_path)
+        if not path.exists(fullpath):
+            raise IOError("File %s does not exist"%fullpath)
+        full_paths.append(fullpath)
+    return full_paths
+
+
+def get_world_builder(model_paths, dt, copies=1, lane_width=1.0):
+    """Returns the WorldBuilder of (model_paths, dt, copies, lane_width),
+    creating it on first use or when one of the files has changed on
+    disk."""
+    key = (tuple(model_paths), dt, copies, lane_width)
+    builder = _builders.get(key)
+    if builder is None or builder.is_stale():
+        if builder is not None:
+            builder.remove_replicated()
+        builder = WorldBuilder(resolve_model_paths(model_paths), dt, copies, lane_width)
+        _builders[key] = builder
+    return builder
+
+
+def clear_world_builders():
+    for builder in _builders.values():
+        builder.remove_replicated()
+    _builders.clear()
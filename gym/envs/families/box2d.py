@@ -0,0 +1,36 @@
+from gym.envs.registration import register
+
+register(
+    id='LunarLander-v2',
+    entry_point='gym.envs.box2d:LunarLander',
+    max_episode_steps=1000,
+    reward_threshold=200,
+)
+
+register(
+    id='LunarLanderContinuous-v2',
+    entry_point='gym.envs.box2d:LunarLanderContinuous',
+    max_episode_steps=1000,
+    reward_threshold=200,
+)
+
+register(
+    id='BipedalWalker-v2',
+    entry_point='gym.envs.box2d:BipedalWalker',
+    max_episode_steps=1600,
+    reward_threshold=300,
+)
+
+register(
+    id='BipedalWalkerHardcore-v2',
+    entry_point='gym.envs.box2d:BipedalWalkerHardcore',
+    max_episode_steps=2000,
+    reward_threshold=300,
+)
+
+register(
+    id='CarRacing-v0',
+    entry_point='gym.envs.box2d:CarRacing',
+    max_episode_steps=1000,
+    reward_threshold=900,
+)
@@ -0,0 +1,100 @@
+from gym.envs.registration import register
+
+register(
+    id='DartHopper-v1',
+    entry_point='gym.envs.dart:DartHopperEnv',
+    reward_threshold=3800.0,
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartHalfCheetah-v1',
+    entry_point='gym.envs.dart:DartHalfCheetahEnv',
+    reward_threshold=4800.0,
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartCartPole-v1',
+    entry_point='gym.envs.dart:DartCartPoleEnv',
+    reward_threshold=950.0,
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartDoubleInvertedPendulumEnv-v1',
+    entry_point='gym.envs.dart:DartDoubleInvertedPendulumEnv',
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartReacher-v1',
+    entry_point='gym.envs.dart:DartReacher2dEnv',
+    reward_threshold=-3.75,
+    max_episode_steps=50,
+)
+
+register(
+    id='DartReacher3d-v1',
+    entry_point='gym.envs.dart:DartReacherEnv',
+    reward_threshold=-200,
+    max_episode_steps=500,
+)
+
+register(
+    id='DartDog-v1',
+    entry_point='gym.envs.dart:DartDogEnv',
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartCartPoleImg-v1',
+    entry_point='gym.envs.dart:DartCartPoleImgEnv',
+    reward_threshold=950.0,
+    max_episode_steps=2000,
+)
+
+# same task rendered through EGL, for nodes without an X display
+register(
+    id='DartCartPoleImgHeadless-v1',
+    entry_point='gym.envs.dart:DartCartPoleImgEnv',
+    kwargs={'render_backend': 'egl'},
+    reward_threshold=950.0,
+    max_episode_steps=2000,
+)
+
+register(
+    id='DartCartPoleSwingUp-v1',
+    entry_point='gym.envs.dart:DartCartPoleSwingUpEnv',
+    max_episode_steps=500,
+)
+
+register(
+    id='DartWalker2d-v1',
+    entry_point='gym.envs.dart:DartWalker2dEnv',
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartWalker3d-v1',
+    entry_point='gym.envs.dart:DartWalker3dEnv',
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartWalker3dSPD-v1',
+    entry_point='gym.envs.dart:DartWalker3dSPDEnv',
+    max_episode_steps=1000,
+)
+
+register(
+    id='DartHumanWalker-v1',
+    entry_point='gym.envs.dart:DartHumanWalkerEnv',
+    max_episode_steps=300,
+)
+
+register(
+    id='DartSnake7Link-v1',
+    entry_point='gym.envs.dart:DartSnake7LinkEnv',
+    max_episode_steps=1000,
+)
@@ -0,0 +1,97 @@
+from gym.envs.registration import register
+
+# 2D
+register(
+    id='Reacher-v2',
+    entry_point='gym.envs.mujoco:ReacherEnv',
+    max_episode_steps=50,
+    reward_threshold=-3.75,
+)
+
+register(
+    id='Reacher3d-v1',
+    entry_point='gym.envs.mujoco:Reacher3dEnv',
+    max_episode_steps=500,
+    reward_threshold=-200,
+)
+
+register(
+    id='Pusher-v2',
+    entry_point='gym.envs.mujoco:PusherEnv',
+    max_episode_steps=100,
+    reward_threshold=0.0,
+)
+
+register(
+    id='Thrower-v2',
+    entry_point='gym.envs.mujoco:ThrowerEnv',
+    max_episode_steps=100,
+    reward_threshold=0.0,
+)
+
+register(
+    id='Striker-v2',
+    entry_point='gym.envs.mujoco:StrikerEnv',
+    max_episode_steps=100,
+    reward_threshold=0.0,
+)
+
+register(
+    id='InvertedPendulum-v2',
+    entry_point='gym.envs.mujoco:InvertedPendulumEnv',
+    max_episode_steps=1000,
+    reward_threshold=950.0,
+)
+
+register(
+    id='InvertedDoublePendulum-v2',
+    entry_point='gym.envs.mujoco:InvertedDoublePendulumEnv',
+    max_episode_steps=1000,
+    reward_threshold=9100.0,
+)
+
+register(
+    id='HalfCheetah-v2',
+    entry_point='gym.envs.mujoco:HalfCheetahEnv',
+    max_episode_steps=1000,
+    reward_threshold=4800.0,
+)
+
+register(
+    id='Hopper-v2',
+    entry_point='gym.envs.mujoco:HopperEnv',
+    max_episode_steps=1000,
+    reward_threshold=3800.0,
+)
+
+register(
+    id='Swimmer-v2',
+    entry_point='gym.envs.mujoco:SwimmerEnv',
+    max_episode_steps=1000,
+    reward_threshold=360.0,
+)
+
+register(
+    id='Walker2d-v2',
+    max_episode_steps=1000,
+    entry_point='gym.envs.mujoco:Walker2dEnv',
+)
+
+register(
+    id='Ant-v2',
+    entry_point='gym.envs.mujoco:AntEnv',
+    max_episode_steps=1000,
+    reward_threshold=6000.0,
+)
+
+register(
+    id='Humanoid-v2',
+    entry_point='gym.envs.mujoco:HumanoidEnv',
+    max_episode_steps=1000,
+)
+
+register(
+    id='HumanoidStandup-v2',
+    entry_point='gym.envs.mujoco:HumanoidStandupEnv',
+    max_episode_steps=1000,
+)
@@ -1,3 +1,5 @@
+import collections
+import importlib
 import re
 from gym import error, logger
 
@@ -8,10 +10,23 @@ from gym import error, logger
 # to include an optional username.
 env_id_re = re.compile(r'^(?:[\w:-]+\/)?([\w:.-]+)-v(\d+)$')
 
+# entry point -> resolved object, per process
+_entry_points = {}
+
 def load(name):
-    import pkg_resources # takes ~400ms to load, so we import it lazily
-    entry_point = pkg_resources.EntryPoint.parse('x={}'.format(name))
-    result = entry_point.load(False)
+    """Resolves an entry point 'package.module:attr.attr' with importlib
+    (pkg_resources, which takes ~400ms to import, is not needed). Results
+    are cached, so later makes of the same env skip the lookup.
+    """
+    try:
+        return _entry_points[name]
+    except KeyError:
+        pass
+    module_name, _, attrs = name.partition(':')
+    result = importlib.import_module(module_name.strip())
+    for attr in attrs.strip().split('.') if attrs.strip() else []:
+        result = getattr(result, attr)
+    _entry_points[name] = result
     return result
 
 class EnvSpec(object):
@@ -74,16 +89,19 @@ class EnvSpec(object):
         self._local_only = local_only
         self._kwargs = {} if kwargs is None else kwargs
 
-    def make(self):
-        """Instantiates an instance of the environment with appropriate kwargs"""
+    def make(self, **kwargs):
+        """Instantiates an instance of the environment with appropriate kwargs.
+        Keyword arguments given here override the registered ones."""
         if self._entry_point is None:
             raise error.Error('Attempting to make deprecated env {}. (HINT: is there a newer registered version of this env?)'.format(self.id))
 
-        elif callable(self._entry_point):
-            env = self._entry_point()
+        _kwargs = self._kwargs.copy()
+        _kwargs.update(kwargs)
+        if callable(self._entry_point):
+            env = self._entry_point(**_kwargs)
         else:
             cls = load(self._entry_point)
-            env = cls(**self._kwargs)
+            env = cls(**_kwargs)
 
         # Make the enviroment aware of which spec it came from.
         env.unwrapped.spec = self
@@ -112,11 +130,13 @@ class EnvRegistry(object):
 
     def __init__(self):
         self.env_specs = {}
+        # family name -> module that registers its envs when imported
+        self._families = collections.OrderedDict()
 
-    def make(self, id):
+    def make(self, id, **kwargs):
         logger.info('Making new env: %s', id)
         spec = self.spec(id)
-        env = spec.make()
+        env = spec.make(**kwargs)
         # We used to have people override _reset/_step rather than
         # reset/step. Set _gym_disable_underscore_compat = True on
         # your environment if you use these methods and don't want
@@ -132,13 +152,29 @@ class EnvRegistry(object):
 
 
     def all(self):
+        self.load_families()
         return self.env_specs.values()
 
+    def register_family(self, name, module):
+        """Defers the registration of a family of envs: `module`, whose
+        import registers them with `register`, is imported the first time an
+        id that is not registered yet is looked up, or by `all()`. Processes
+        that only make envs registered up front never import it.
+        """
+        self._families[name] = module
+
+    def load_families(self):
+        while self._families:
+            _, module = self._families.popitem(last=False)
+            importlib.import_module(module)
+
     def spec(self, id):
         match = env_id_re.search(id)
         if not match:
             raise error.Error('Attempted to look up malformed environment ID: {}. (Currently all IDs must be of the form {}.)'.format(id.encode('utf-8'), env_id_re.pattern))
 
+        if id not in self.env_specs:
+            self.load_families()
         try:
             return self.env_specs[id]
         except KeyError:
@@ -163,8 +199,8 @@ registry = EnvRegistry()
 def register(id, **kwargs):
     return registry.register(id, **kwargs)
 
-def make(id):
-    return registry.make(id)
+def make(id, **kwargs):
+    return registry.make(id, **kwargs)
 
 def spec(id):
     return registry.spec(id)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from gym.envs import classic_control
+
+batched_pairs = [
+    (classic_control.BatchedCartPoleEnv, classic_control.CartPoleEnv),
+    (classic_control.BatchedPendulumEnv, classic_control.PendulumEnv),
+    (classic_control.BatchedMountainCarEnv, classic_control.MountainCarEnv),
+    (classic_control.BatchedContinuous_MountainCarEnv, classic_control.Continuous_MountainCarEnv),
+    (classic_control.BatchedAcrobotEnv, classic_control.AcrobotEnv),
+]
+
+@pytest.mark.parametrize("batched_cls,single_cls", batched_pairs)
+def test_batched_matches_single(batched_cls, single_cls):
+    num_envs = 8
+    venv = batched_cls(num_envs)
+    venv.seed(0)
+    observations = venv.reset()
+    assert observations.shape == (num_envs,) + venv.observation_space.shape
+
+    env = single_cls()
+    env.seed(0)
+    env.reset()
+    for _ in range(60):
+        states = venv.state.copy()
+        actions = np.array([venv.action_space.sample() for _ in range(num_envs)])
+        observations, rewards, dones, infos = venv.step(actions)
+        for i in range(num_envs):
+            env.state = states[i].copy()
+            env.steps_beyond_done = None
+            ob, reward, done, _ = env.step(actions[i])
+            assert np.isclose(reward, rewards[i])
+            assert done == dones[i]
+            expected = infos[i]['terminal_observation'] if done else observations[i]
+            assert np.allclose(ob, expected)
+
+def test_time_limit_resets_instances():
+    venv = classic_control.BatchedPendulumEnv(4, max_episode_steps=3)
+    venv.reset()
+    for t in range(1, 7):
+        _, _, dones, infos = venv.step(np.zeros((4, 1)))
+        assert dones.all() == (t % 3 == 0)
+        assert all(('terminal_observation' in info) == dones[i] for i, info in enumerate(infos))
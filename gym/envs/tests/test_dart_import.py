@@ -0,0 +1,26 @@
+import importlib.util
+import subprocess
+import sys
+
+import pytest
+
+# seconds; importing gym.envs.dart must not load the GL/GLUT stack
+IMPORT_TIME_BUDGET = 3.0
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.time()
+import gym.envs.dart
+print(time.time() - start)
+print(sorted(name for name in sys.modules if name.split('.')[0] == 'OpenGL'))
+"""
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pydart2') is None, reason='pydart2 is not installed')
+def test_dart_import_is_headless_and_fast():
+    # a fresh interpreter, so that nothing is imported already
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT]).decode().strip().splitlines()
+    elapsed, gl_modules = float(output[-2]), output[-1]
+    print('import gym.envs.dart: {:.3f} s'.format(elapsed))
+    assert gl_modules == '[]', 'gym.envs.dart imported {}'.format(gl_modules)
+    assert elapsed < IMPORT_TIME_BUDGET
@@ -0,0 +1,60 @@
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+import gym.envs
+from gym import spaces
+
+# loaded from its file: gym.envs.dart itself needs pydart2, linearize does not
+_path = os.path.join(os.path.dirname(gym.envs.__file__), 'dart', 'linearize.py')
+_spec = importlib.util.spec_from_file_location('dart_linearize', _path)
+linearize = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(linearize)
+
+A = np.array([[1.0, 0.1, 0.0],
+              [-0.2, 0.9, 0.3],
+              [0.0, 0.05, 1.1]])
+B = np.array([[0.0, 0.5],
+              [1.0, 0.0],
+              [0.2, -0.4]])
+
+
+class LinearEnv(object):
+    """x_next = A x + B u, with the state API the Linearizer uses."""
+
+    def __init__(self):
+        self.action_space = spaces.Box(-np.ones(2), np.ones(2))
+        self.unwrapped = self
+        self.x = np.array([0.3, -0.1, 0.7])
+
+    def clone_state(self):
+        return self.x.copy()
+
+    def restore_state(self, state):
+        self.x = np.array(state)
+
+    def set_state_vector(self, x):
+        self.x = np.array(x)
+
+    def state_vector(self):
+        return self.x.copy()
+
+    def step(self, u):
+        self.x = A.dot(self.x) + B.dot(u)
+
+
+@pytest.mark.parametrize('central', [True, False])
+def test_linearize_linear_env(central):
+    env = LinearEnv()
+    state = env.clone_state()
+    u = np.array([0.2, -0.3])
+    lin = linearize.Linearizer(env, eps=1e-6, central=central).linearize(action=u)
+
+    assert np.allclose(lin.A, A, atol=1e-6)
+    assert np.allclose(lin.B, B, atol=1e-6)
+    assert np.allclose(lin.x, state)
+    assert np.allclose(lin.x_next, A.dot(state) + B.dot(u))
+    # the env is left in the linearized state
+    assert np.array_equal(env.state_vector(), state)
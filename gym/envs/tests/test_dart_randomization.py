@@ -0,0 +1,80 @@
+import importlib.util
+import os
+
+import numpy as np
+
+import gym.envs
+from gym.utils import seeding
+
+# loaded from its file: gym.envs.dart itself needs pydart2, randomization does not
+_path = os.path.join(os.path.dirname(gym.envs.__file__), 'dart', 'randomization.py')
+_spec = importlib.util.spec_from_file_location('dart_randomization', _path)
+randomization = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(randomization)
+
+
+class FakeBodyNode(object):
+    def __init__(self, mass):
+        self._mass = mass
+        self.writes = 0
+
+    def mass(self):
+        return self._mass
+
+    def set_mass(self, mass):
+        self._mass = mass
+        self.writes += 1
+
+
+class FakeSkeleton(object):
+    def __init__(self, masses):
+        self.bodynodes = [FakeBodyNode(m) for m in masses]
+
+
+class FakeEnv(object):
+    def __init__(self, masses=(1.0, 2.0, 3.0), seed=0):
+        self.robot_skeleton = FakeSkeleton(masses)
+        self.np_random, _ = seeding.np_random(seed)
+
+    def masses(self):
+        return np.array([bn.mass() for bn in self.robot_skeleton.bodynodes])
+
+
+def test_randomize_is_reproducible_per_seed():
+    def draws(seed):
+        env = FakeEnv(seed=seed)
+        randomizer = randomization.DomainRandomizer(env, {'mass': (0.5, 1.5, 'scale')})
+        masses = []
+        for _ in range(3):
+            randomizer.randomize()
+            masses.append(env.masses())
+        return np.array(masses)
+
+    assert np.array_equal(draws(0), draws(0))
+    assert not np.array_equal(draws(0), draws(1))
+
+
+def test_randomize_clips_to_lower_limit():
+    env = FakeEnv()
+    randomizer = randomization.DomainRandomizer(env, {'mass': (-10.0, -5.0)})
+    randomizer.randomize()
+    assert np.all(env.masses() == randomization.PARAMETERS['mass'][3])
+
+    randomizer.restore_nominal()
+    assert np.array_equal(env.masses(), [1.0, 2.0, 3.0])
+
+
+def test_apply_writes_only_changed_elements():
+    env = FakeEnv()
+    randomizer = randomization.DomainRandomizer(env, {'mass': (0.0, 0.0)})
+    bodynodes = env.robot_skeleton.bodynodes
+
+    randomizer.randomize()
+    assert [bn.writes for bn in bodynodes] == [0, 0, 0]
+
+    randomizer.set_values({'mass': np.array([1.0, 4.0, 3.0])})
+    assert [bn.writes for bn in bodynodes] == [0, 1, 0]
+    assert np.array_equal(env.masses(), [1.0, 4.0, 3.0])
+
+    randomizer.restore_nominal()
+    assert [bn.writes for bn in bodynodes] == [0, 2, 0]
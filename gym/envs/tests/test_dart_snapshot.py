@@ -0,0 +1,114 @@
+import importlib.util
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import gym.envs
+
+
+class FakeApi(object):
+    """The pydart2_api calls of SkeletonSnapshot.update."""
+
+    def skeleton__getPositions(self, wid, skid, ndofs):
+        return np.arange(ndofs, dtype=np.float64)
+
+    def skeleton__getVelocities(self, wid, skid, ndofs):
+        return -np.arange(ndofs, dtype=np.float64)
+
+
+def _load_snapshot():
+    # loaded from its file with a stand-in pydart2_api: gym.envs.dart itself
+    # needs pydart2, and the snapshot only calls it in update()
+    saved = dict((name, sys.modules.get(name)) for name in ('pydart2', 'pydart2.pydart2_api'))
+    api = types.ModuleType('pydart2.pydart2_api')
+    api.__dict__.update((name, getattr(FakeApi(), name)) for name in dir(FakeApi) if not name.startswith('_'))
+    package = types.ModuleType('pydart2')
+    package.pydart2_api = api
+    sys.modules.update({'pydart2': package, 'pydart2.pydart2_api': api})
+    try:
+        path = os.path.join(os.path.dirname(gym.envs.__file__), 'dart', 'snapshot.py')
+        spec = importlib.util.spec_from_file_location('dart_snapshot', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for name, module_ in saved.items():
+            if module_ is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module_
+    return module
+
+
+snapshot = _load_snapshot()
+
+
+class FakeBodyNode(object):
+    def __init__(self, index):
+        self.index = index
+        self.T = np.eye(4) * (index + 1)
+
+    def com(self):
+        return np.full(3, float(self.index))
+
+
+class FakeSkeleton(object):
+    """Shaped like a pydart2 0.7.6 Skeleton, including its `bodynode`, whose
+    integer branch reads a missing `bodies` attribute."""
+
+    def __init__(self, names=('torso', 'thigh', 'leg', 'foot'), ndofs=3):
+        self.world = types.SimpleNamespace(id=0)
+        self.id = 1
+        self.ndofs = ndofs
+        self.q_lower = -np.ones(ndofs)
+        self.q_upper = np.ones(ndofs)
+        self.bodynodes = [FakeBodyNode(i) for i in range(len(names))]
+        self.name_to_body = dict(zip(names, self.bodynodes))
+
+    def bodynode(self, query):
+        if isinstance(query, str):
+            return self.name_to_body[query]
+        elif isinstance(query, int):
+            return self.bodies[query]
+        return None
+
+
+def test_find_bodynode_by_name_and_index():
+    skel = FakeSkeleton()
+    assert snapshot.find_bodynode(skel, 'leg') is skel.bodynodes[2]
+    assert snapshot.find_bodynode(skel, 2) is skel.bodynodes[2]
+    assert snapshot.find_bodynode(skel, np.int64(3)) is skel.bodynodes[3]
+
+
+def test_snapshot_tracks_bodynodes_by_index():
+    skel = FakeSkeleton()
+    snap = snapshot.SkeletonSnapshot(skel, [0, 'foot', np.int64(2)])
+    assert [snap.bodynodes[name].index for name in snap.names] == [0, 3, 2]
+
+
+def test_snapshot_reads_bodynode_tracked_by_index():
+    # as DartHopperEnv, DartWalker2dEnv and DartReacherEnv track body node 2
+    skel = FakeSkeleton()
+    snap = snapshot.SkeletonSnapshot(skel, [2]).update()
+    assert np.array_equal(snap.com(2), [2.0, 2.0, 2.0])
+    assert np.array_equal(snap.transform(2), np.eye(4) * 3)
+    assert np.array_equal(snap.x, [0.0, 1.0, 2.0, 0.0, -1.0, -2.0])
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pydart2') is None, reason='pydart2 is not installed')
+def test_batched_copies_track_bodynode_by_index():
+    from gym.envs.dart import batched, snapshot as dart_snapshot
+
+    env = batched.BatchedDartHopperEnv.__new__(batched.BatchedDartHopperEnv)
+    env.num_envs = 2
+    env.robots = [FakeSkeleton(), FakeSkeleton()]
+    env.robot_skeleton = env.robots[0]
+    papi, dart_snapshot.papi = dart_snapshot.papi, FakeApi()
+    try:
+        env._init_copies([2])
+    finally:
+        dart_snapshot.papi = papi
+    assert np.array_equal(env.coms[:, 0], [[2.0, 2.0, 2.0]] * 2)
+    assert np.array_equal(env.init_x, [[0.0, 1.0, 2.0, 0.0, -1.0, -2.0]] * 2)
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import subprocess
+import sys
+
 from gym import error, envs
 from gym.envs import registration
 from gym.envs.classic_control import cartpole
@@ -48,3 +51,33 @@ def test_malformed_lookup():
         assert 'malformed environment ID' in '{}'.format(e), 'Unexpected message: {}'.format(e)
     else:
         assert False
+
+def test_make_with_kwargs():
+    registry = registration.EnvRegistry()
+    registry.register(id='FrozenLakeKwargs-v0', entry_point='gym.envs.toy_text:FrozenLakeEnv',
+                      kwargs={'map_name': '4x4', 'is_slippery': True})
+    env = registry.make('FrozenLakeKwargs-v0', map_name='8x8')
+    assert env.unwrapped.nrow == 8
+    assert env.unwrapped.spec._kwargs == {'map_name': '4x4', 'is_slippery': True}
+
+def test_load_entry_point():
+    assert registration.load('gym.envs.classic_control.cartpole:CartPoleEnv') is cartpole.CartPoleEnv
+    assert registration.load('gym.envs.classic_control:cartpole.CartPoleEnv') is cartpole.CartPoleEnv
+    assert registration.load('gym.envs.classic_control.cartpole') is cartpole
+
+def test_families_load_on_first_lookup():
+    # a fresh interpreter, in which no family has been looked up yet
+    script = '\n'.join([
+        'import sys',
+        'import gym',
+        'gym.make("CartPole-v0")',
+        'print(sorted(m for m in sys.modules if m.startswith("gym.envs.families.")))',
+        'print(gym.spec("Hopper-v2").id)',
+        'print("gym.envs.families.atari" in sys.modules)',
+    ])
+    output = subprocess.check_output([sys.executable, '-c', script]).decode().strip().splitlines()
+    assert output[-3:] == ['[]', 'Hopper-v2', 'True']
+
+def test_all_includes_families():
+    ids = set(spec.id for spec in envs.registry.all())
+    assert set(['LunarLander-v2', 'DartHopper-v1', 'Hopper-v2', 'FetchReach-v1', 'Pong-v0']) <= ids
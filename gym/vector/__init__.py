@@ -0,0 +1,2 @@
+from gym.vector.vector_env import VectorEnv
+from gym.vector.subproc_vec_env import SubprocVecEnv
@@ -0,0 +1,137 @@
+"""
+CPU placement and thread limits for vector env workers.
+
+Each worker of a SubprocVecEnv is a full process with its own NumPy, and a
+multithreaded BLAS (OpenBLAS, MKL) or OpenMP runtime starts a thread team
+per process, sized for the whole machine. With dozens of workers the box
+is oversubscribed many times over. `limit_threads` caps those teams, and
+`worker_cpus` pins each worker to a core or NUMA node according to a
+placement policy.
+
+Policies:
+    'compact': one core per worker, filling a NUMA node before the next.
+    'scatter': one core per worker, alternating between NUMA nodes.
+    'numa': each worker may run on every core of one NUMA node, nodes
+      taken in turn.
+"""
+
+import contextlib
+import os
+
+from gym import error, logger
+
+# read by the BLAS and OpenMP runtimes when they are loaded
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                   'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+POLICIES = ('compact', 'scatter', 'numa')
+
+
+def thread_env(threads):
+    """The environment variables limiting BLAS/OpenMP to `threads` threads."""
+    return dict((name, str(threads)) for name in THREAD_ENV_VARS)
+
+
+@contextlib.contextmanager
+def environ(values):
+    """Sets the environment variables `values` for the duration of the
+    block, e.g. while worker processes are started so that they inherit
+    them."""
+    saved = dict((name, os.environ.get(name)) for name in values)
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def limit_threads(threads):
+    """Limits the BLAS/OpenMP thread teams of the current process.
+
+    The environment variables only take effect in libraries loaded after
+    this call (a worker started with 'spawn' or 'forkserver' imports NumPy
+    anew and picks them up). Runtimes already loaded, e.g. NumPy's BLAS in
+    a forked worker, are limited through threadpoolctl if it is installed.
+    """
+    os.environ.update(thread_env(threads))
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(threads)
+
+
+def pin(cpus):
+    """Restricts the current process to the CPU ids `cpus`."""
+    if not hasattr(os, 'sched_setaffinity'):
+        logger.warn('CPU affinity is not supported on this platform; workers are not pinned')
+        return
+    os.sched_setaffinity(0, cpus)
+
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_cpulist(text):
+    """Parses a Linux cpulist such as '0-3,8,10-11' into a list of ids."""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def numa_nodes():
+    """Returns the CPU ids of each NUMA node that this process may run on,
+    read from sysfs. Machines without NUMA information are one node."""
+    available = set(available_cpus())
+    root = '/sys/devices/system/node'
+    nodes = []
+    if os.path.isdir(root):
+        for name in sorted(os.listdir(root)):
+            if not (name.startswith('node') and name[4:].isdigit()):
+                continue
+            with open(os.path.join(root, name, 'cpulist')) as f:
+                cpus = [cpu for cpu in parse_cpulist(f.read()) if cpu in available]
+            if cpus:
+                nodes.append((int(name[4:]), cpus))
+    if not nodes:
+        return [sorted(available)]
+    return [cpus for _, cpus in sorted(nodes)]
+
+
+def worker_cpus(policy, num_workers, nodes=None):
+    """Returns the set of CPU ids of each of `num_workers` workers under
+    `policy` (see the module docstring). Workers wrap around when there are
+    more of them than cores (or nodes).
+
+    Args:
+        policy (str): 'compact', 'scatter' or 'numa'.
+        num_workers (int): number of workers.
+        nodes (Optional[list<list<int>>]): CPU ids per NUMA node; defaults
+          to `numa_nodes()`.
+    """
+    if policy not in POLICIES:
+        raise error.Error('Unknown placement policy {!r}; expected one of {}'.format(policy, POLICIES))
+    if nodes is None:
+        nodes = numa_nodes()
+    if policy == 'numa':
+        return [set(nodes[i % len(nodes)]) for i in range(num_workers)]
+    if policy == 'compact':
+        cores = [cpu for cpus in nodes for cpu in cpus]
+    else:
+        depth = max(len(cpus) for cpus in nodes)
+        cores = [cpus[j] for j in range(depth) for cpus in nodes if j < len(cpus)]
+    return [set([cores[i % len(cores)]]) for i in range(num_workers)]
@@ -0,0 +1,27 @@
+"""
+Builds, at import, one instance of each env named in the comma-separated
+GYM_PREWARM_ENVS variable and closes it again.
+
+Preloaded by the fork server of worker_factory.forkserver_context, so the
+env modules, their dependencies and their per-process caches are loaded
+before any worker is forked.
+"""
+
+import os
+
+import gym
+from gym import logger
+from gym.vector.worker_factory import PREWARM_ENV_VAR
+
+
+def prewarm(env_ids):
+    for env_id in env_ids:
+        try:
+            env = gym.make(env_id)
+            env.close()
+        except Exception as e:
+            # an exception here would take the fork server down with it
+            logger.warn('Could not prewarm %s: %s', env_id, e)
+
+
+prewarm([env_id for env_id in os.environ.get(PREWARM_ENV_VAR, '').split(',') if env_id])
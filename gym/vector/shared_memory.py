@@ -0,0 +1,23 @@
+import ctypes
+
+import numpy as np
+
+
+def create_shared_array(ctx, shape, dtype):
+    """Allocates a lock-free shared-memory buffer that can be handed to
+    child processes of the multiprocessing context `ctx`.
+    """
+    dtype = np.dtype(dtype)
+    if dtype == np.bool_:
+        typecode = ctypes.c_bool
+    else:
+        typecode = np.ctypeslib.as_ctypes_type(dtype)
+    size = int(np.prod(shape)) if len(shape) > 0 else 1
+    return ctx.RawArray(typecode, size)
+
+
+def shared_array_view(raw, shape, dtype):
+    """Returns a NumPy view onto a buffer made by `create_shared_array`.
+    Writes through the view are visible to every process sharing `raw`.
+    """
+    return np.frombuffer(raw, dtype=np.dtype(dtype)).reshape(shape)
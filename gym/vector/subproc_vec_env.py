@@ -0,0 +1,367 @@
+import multiprocessing
+import sys
+import time
+import traceback
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from gym import error, logger, spaces
+from gym.vector.placement import environ, limit_threads, pin, thread_env, worker_cpus
+from gym.vector.shared_memory import create_shared_array, shared_array_view
+from gym.vector.vector_env import VectorEnv
+
+
+def _batch_shape(space, num_envs):
+    return (num_envs,) + tuple(space.shape)
+
+
+def _check_space(space, kind):
+    if not isinstance(space, (spaces.Box, spaces.Discrete)):
+        raise error.Error('SubprocVecEnv only supports Box and Discrete {} spaces, got {}'.format(kind, space))
+
+
+def _worker(index, env_fn, pipe, parent_pipe, buffers, layout, cpus=None, threads=None):
+    """Runs one sub-environment. Observations, rewards and dones are written
+    straight into the shared buffers; only the (small) info dicts and
+    command acknowledgements travel through the pipe.
+    """
+    parent_pipe.close()
+    # before the env (and the simulator's libraries) is built
+    if threads is not None:
+        limit_threads(threads)
+    if cpus is not None:
+        pin(cpus)
+    if buffers is not None:
+        observations, rewards, dones, actions = [shared_array_view(raw, shape, dtype)
+                                                 for raw, (shape, dtype) in zip(buffers, layout)]
+        row = observations[index]
+    env = None
+    try:
+        env = env_fn()
+        if buffers is not None:
+            # envs that assemble observations in place (e.g. the DART envs'
+            # ObservationLayout) write straight into this env's row
+            bind = getattr(env.unwrapped, 'set_observation_buffer', None)
+            if bind is not None:
+                bind(row)
+        while True:
+            command, data = pipe.recv()
+            try:
+                if command == 'step':
+                    action = actions[index]
+                    if isinstance(action, np.ndarray):
+                        action = action.copy()
+                    start = time.time()
+                    observation, reward, done, info = env.step(action)
+                    step_time = time.time() - start
+                    reset_time = 0.0
+                    if done:
+                        info = dict(info)
+                        # copied, as a bound row is overwritten by reset()
+                        info['terminal_observation'] = np.array(observation)
+                        start = time.time()
+                        observation = env.reset()
+                        reset_time = time.time() - start
+                    if observation is not row:
+                        row[...] = observation
+                    rewards[index] = reward
+                    dones[index] = done
+                    pipe.send((True, (info, step_time, reset_time)))
+                elif command == 'reset':
+                    observation = env.reset()
+                    if observation is not row:
+                        row[...] = observation
+                    pipe.send((True, None))
+                elif command == 'seed':
+                    pipe.send((True, env.seed(data)))
+                elif command == 'get_spaces':
+                    pipe.send((True, (env.observation_space, env.action_space)))
+                elif command == 'call':
+                    name, args, kwargs = data
+                    attr = getattr(env.unwrapped, name)
+                    pipe.send((True, attr(*args, **kwargs) if callable(attr) else attr))
+                elif command == 'close':
+                    pipe.send((True, None))
+                    break
+                else:
+                    raise error.Error('Unknown command {!r}'.format(command))
+            except Exception:
+                pipe.send((False, ''.join(traceback.format_exception(*sys.exc_info()))))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if env is not None:
+            env.close()
+        pipe.close()
+
+
+class SubprocVecEnv(VectorEnv):
+    """Steps `len(env_fns)` environments in parallel, one worker process each.
+
+    Observations, rewards and dones are returned through preallocated
+    shared-memory arrays rather than pickled through pipes, so the per-step
+    transfer cost does not grow with observation size.
+
+    `step` is `step_async` followed by `step_wait`, which waits for the
+    slowest worker. When episode costs vary a lot between workers,
+    `step_wait_first(k)` instead returns as soon as `k` of them are done,
+    and their actions for the next step can be sent right away while the
+    others are still stepping. A worker whose episode ends resets itself
+    before reporting, so resets overlap with the other workers' steps.
+    `timing_stats()` reports how long each worker spends stepping and
+    resetting.
+
+    Args:
+        env_fns (list<callable>): one constructor per sub-environment. They
+          must be picklable when `context` is not 'fork'.
+        context (Optional[str or context]): multiprocessing start method
+          ('fork', 'spawn' or 'forkserver'), defaulting to the platform
+          default, or a multiprocessing context such as the pre-warmed one
+          of gym.vector.worker_factory.forkserver_context.
+        copy (bool): if True, `step` and `reset` return copies of the shared
+          buffers. With False they return the buffers themselves, which are
+          overwritten by the next call.
+        observation_space, action_space (Optional[gym.Space]): the spaces of
+          a single sub-environment. When omitted they are read from an
+          environment built in a short-lived probe process.
+        placement (Optional[str or list]): pins the workers to CPUs, either
+          by a policy of gym.vector.placement ('compact', 'scatter' or
+          'numa') or by a list holding the CPU ids of each worker.
+        threads (Optional[int]): BLAS/OpenMP threads per worker, e.g. 1
+          when there are as many workers as cores.
+    """
+
+    def __init__(self, env_fns, context=None, copy=True, observation_space=None, action_space=None,
+                 placement=None, threads=None):
+        ctx = context if hasattr(context, 'Process') else multiprocessing.get_context(context)
+        num_envs = len(env_fns)
+        if isinstance(placement, str):
+            placement = worker_cpus(placement, num_envs)
+        if placement is not None and len(placement) != num_envs:
+            raise error.Error('Expected the CPUs of {} workers, got {}'.format(num_envs, len(placement)))
+        self.placement = placement
+        self.threads = threads
+        # spawned workers inherit the thread limits before importing NumPy
+        self._worker_environ = {} if threads is None else thread_env(threads)
+
+        if observation_space is None or action_space is None:
+            # Build the first env in a throwaway process so the parent never
+            # has to import the simulator just to read the spaces.
+            observation_space, action_space = self._probe_spaces(ctx, env_fns[0], threads, self._worker_environ)
+        _check_space(observation_space, 'observation')
+        _check_space(action_space, 'action')
+        VectorEnv.__init__(self, num_envs, observation_space, action_space)
+
+        layout = [
+            (_batch_shape(observation_space, num_envs), observation_space.dtype),
+            ((num_envs,), np.float64),
+            ((num_envs,), np.bool_),
+            (_batch_shape(action_space, num_envs), action_space.dtype),
+        ]
+        buffers = [create_shared_array(ctx, shape, dtype) for shape, dtype in layout]
+        self._observations, self._rewards, self._dones, self._actions = [
+            shared_array_view(raw, shape, dtype) for raw, (shape, dtype) in zip(buffers, layout)]
+        self.copy = copy
+
+        # workers sent actions by step_async whose results have not been read
+        self._pending = []
+        self._step_counts = np.zeros(num_envs, dtype=np.int64)
+        self._step_times = np.zeros(num_envs)
+        self._max_step_times = np.zeros(num_envs)
+        self._reset_counts = np.zeros(num_envs, dtype=np.int64)
+        self._reset_times = np.zeros(num_envs)
+
+        self.parent_pipes, self.processes = [], []
+        for index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            cpus = None if placement is None else placement[index]
+            process = ctx.Process(target=_worker, name='SubprocVecEnv-{}'.format(index),
+                                  args=(index, env_fn, child_pipe, parent_pipe, buffers, layout, cpus, threads))
+            process.daemon = True
+            with environ(self._worker_environ):
+                process.start()
+            child_pipe.close()
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+        self.closed = False
+
+    @staticmethod
+    def _probe_spaces(ctx, env_fn, threads=None, worker_environ=None):
+        parent_pipe, child_pipe = ctx.Pipe()
+        process = ctx.Process(target=_worker, args=(0, env_fn, child_pipe, parent_pipe, None, None, None, threads))
+        process.daemon = True
+        with environ(worker_environ or {}):
+            process.start()
+        child_pipe.close()
+        try:
+            parent_pipe.send(('get_spaces', None))
+            ok, result = parent_pipe.recv()
+            parent_pipe.send(('close', None))
+            parent_pipe.recv()
+        except EOFError:
+            raise error.Error('SubprocVecEnv worker died while constructing its environment')
+        finally:
+            process.join()
+        if not ok:
+            raise error.Error(result)
+        return result
+
+    def _send(self, command, data=None):
+        self._assert_no_pending()
+        for pipe in self.parent_pipes:
+            pipe.send((command, data))
+
+    def _recv(self):
+        results = [pipe.recv() for pipe in self.parent_pipes]
+        for ok, result in results:
+            if not ok:
+                raise error.Error('SubprocVecEnv worker failed:\n{}'.format(result))
+        return [result for _, result in results]
+
+    def _output(self, array):
+        return array.copy() if self.copy else array
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def step_async(self, actions, indices=None):
+        """Sends `actions` to the workers `indices` (default: all) without
+        waiting for them. `actions` holds one action per index. The workers
+        must not have a step in flight.
+        """
+        self._assert_is_running()
+        indices = list(range(self.num_envs)) if indices is None else [int(i) for i in indices]
+        busy = set(indices).intersection(self._pending)
+        if busy:
+            raise error.Error('Workers {} are still stepping; wait for them first'.format(sorted(busy)))
+        self._actions[indices] = actions
+        for i in indices:
+            self.parent_pipes[i].send(('step', None))
+        self._pending.extend(indices)
+
+    def step_wait(self):
+        """Waits for every step in flight. Returns the usual (observations,
+        rewards, dones, infos) batch; when only some workers were stepped,
+        the rows of the others hold their last results and their infos are
+        empty.
+        """
+        self._assert_is_running()
+        indices = sorted(self._pending)
+        infos = [{} for _ in range(self.num_envs)]
+        for i, info in zip(indices, self._receive_steps(indices)):
+            infos[i] = info
+        return self._output(self._observations), self._output(self._rewards), self._output(self._dones), infos
+
+    def step_wait_first(self, k, timeout=None):
+        """Waits until `k` of the steps in flight are done, or until `timeout`
+        seconds have passed, and returns their results as (indices,
+        observations, rewards, dones, infos), in the order they were found
+        ready. The arrays are copies holding one row per index. The other
+        workers keep stepping; their results are returned by later calls.
+        """
+        self._assert_is_running()
+        k = min(k, len(self._pending))
+        deadline = None if timeout is None else time.time() + timeout
+        pipes = dict((self.parent_pipes[i], i) for i in self._pending)
+        ready = []
+        while len(ready) < k:
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            finished = wait(list(pipes), remaining)
+            if not finished:
+                break
+            for pipe in finished[:k - len(ready)]:
+                ready.append(pipes.pop(pipe))
+        infos = self._receive_steps(ready)
+        return (np.array(ready, dtype=np.int64), self._observations[ready], self._rewards[ready],
+                self._dones[ready], infos)
+
+    def _receive_steps(self, indices):
+        infos = []
+        try:
+            for i in indices:
+                ok, result = self.parent_pipes[i].recv()
+                if not ok:
+                    raise error.Error('SubprocVecEnv worker failed:\n{}'.format(result))
+                info, step_time, reset_time = result
+                self._step_counts[i] += 1
+                self._step_times[i] += step_time
+                self._max_step_times[i] = max(self._max_step_times[i], step_time)
+                if self._dones[i]:
+                    self._reset_counts[i] += 1
+                    self._reset_times[i] += reset_time
+                infos.append(info)
+        finally:
+            received = set(indices[:len(infos) + 1])
+            self._pending = [i for i in self._pending if i not in received]
+        return infos
+
+    def timing_stats(self):
+        """Returns per-worker timings as a dict of (num_envs,) arrays:
+        'steps' and 'resets' count the steps and automatic resets,
+        'step_time' and 'reset_time' are their mean durations in seconds,
+        and 'max_step_time' is the slowest step.
+        """
+        steps = np.maximum(self._step_counts, 1)
+        resets = np.maximum(self._reset_counts, 1)
+        return {
+            'steps': self._step_counts.copy(),
+            'resets': self._reset_counts.copy(),
+            'step_time': self._step_times / steps,
+            'reset_time': self._reset_times / resets,
+            'max_step_time': self._max_step_times.copy(),
+        }
+
+    def reset(self):
+        self._assert_is_running()
+        self._send('reset')
+        self._recv()
+        return self._output(self._observations)
+
+    def seed(self, seeds=None):
+        self._assert_is_running()
+        self._assert_no_pending()
+        for pipe, seed in zip(self.parent_pipes, self._seed_list(seeds)):
+            pipe.send(('seed', seed))
+        return self._recv()
+
+    def call(self, name, *args, **kwargs):
+        """Calls method `name` (or reads attribute `name`) on every
+        unwrapped sub-environment and returns the list of results.
+        """
+        self._assert_is_running()
+        self._send('call', (name, args, kwargs))
+        return self._recv()
+
+    def render(self, mode='human'):
+        raise error.UnsupportedMode('SubprocVecEnv does not render; call render on a single env instead')
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for i, (pipe, process) in enumerate(zip(self.parent_pipes, self.processes)):
+            try:
+                if i in self._pending:
+                    pipe.recv()
+                if process.is_alive():
+                    pipe.send(('close', None))
+                    pipe.recv()
+            except (EOFError, IOError):
+                logger.warn('SubprocVecEnv worker %s exited before close', process.name)
+            pipe.close()
+        for process in self.processes:
+            process.join()
+
+    def _assert_no_pending(self):
+        if self._pending:
+            raise error.Error('Workers {} are still stepping; call step_wait first'.format(sorted(self._pending)))
+
+    def _assert_is_running(self):
+        if self.closed:
+            raise error.Error('Trying to operate on a closed {}'.format(type(self).__name__))
+
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
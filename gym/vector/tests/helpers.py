@@ -0,0 +1,6 @@
+import gym
+
+
+def make_cartpole():
+    # env_fns are pickled to the workers, so they live in an importable module
+    return gym.make('CartPole-v0')
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+
+from gym import error
+from gym.vector import SubprocVecEnv
+from gym.vector.placement import environ, parse_cpulist, worker_cpus
+from gym.vector.tests.helpers import make_cartpole
+
+
+def test_parse_cpulist():
+    assert parse_cpulist('0-3,8,10-11\n') == [0, 1, 2, 3, 8, 10, 11]
+
+
+def test_worker_cpus():
+    nodes = [[0, 1], [2, 3]]
+    assert worker_cpus('compact', 5, nodes) == [{0}, {1}, {2}, {3}, {0}]
+    assert worker_cpus('scatter', 4, nodes) == [{0}, {2}, {1}, {3}]
+    assert worker_cpus('numa', 3, nodes) == [{0, 1}, {2, 3}, {0, 1}]
+    try:
+        worker_cpus('everywhere', 2, nodes)
+    except error.Error:
+        pass
+    else:
+        assert False, 'Should reject an unknown policy'
+
+
+def test_environ_restores():
+    name = 'OPENBLAS_NUM_THREADS'
+    before = os.environ.get(name)
+    with environ({name: '3'}):
+        assert os.environ[name] == '3'
+    assert os.environ.get(name) == before
+
+
+def test_pinned_workers_step():
+    venv = SubprocVecEnv([make_cartpole] * 2, placement='compact', threads=1)
+    try:
+        assert len(venv.placement) == 2
+        venv.reset()
+        _, rewards, _, _ = venv.step(np.zeros(2, dtype=np.int64))
+        assert rewards.shape == (2,)
+    finally:
+        venv.close()
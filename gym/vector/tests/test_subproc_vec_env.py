@@ -0,0 +1,93 @@
+import numpy as np
+
+from gym import error
+from gym.vector import SubprocVecEnv
+from gym.vector.tests.helpers import make_cartpole
+
+
+def test_step_matches_single_envs():
+    num_envs = 3
+    venv = SubprocVecEnv([make_cartpole] * num_envs)
+    try:
+        venv.seed(7)
+        observations = venv.reset()
+        assert observations.shape == (num_envs, 4)
+
+        envs = [make_cartpole() for _ in range(num_envs)]
+        for i, env in enumerate(envs):
+            env.seed(7 + i)
+            assert np.allclose(env.reset(), observations[i])
+
+        for _ in range(50):
+            actions = np.array([venv.action_space.sample() for _ in range(num_envs)])
+            observations, rewards, dones, infos = venv.step(actions)
+            assert rewards.shape == (num_envs,) and dones.shape == (num_envs,)
+            for i, env in enumerate(envs):
+                ob, reward, done, _ = env.step(int(actions[i]))
+                assert reward == rewards[i] and done == dones[i]
+                if done:
+                    assert np.allclose(ob, infos[i]['terminal_observation'])
+                    ob = env.reset()
+                assert np.allclose(ob, observations[i])
+    finally:
+        venv.close()
+
+
+def test_closed_env_raises():
+    venv = SubprocVecEnv([make_cartpole] * 2)
+    venv.close()
+    venv.close()  # idempotent
+    try:
+        venv.reset()
+    except error.Error:
+        pass
+    else:
+        assert False, 'Should not be able to reset a closed vector env'
+
+
+def test_step_async_matches_step():
+    num_envs = 3
+    venv, reference = SubprocVecEnv([make_cartpole] * num_envs), SubprocVecEnv([make_cartpole] * num_envs)
+    try:
+        for v in (venv, reference):
+            v.seed(3)
+            v.reset()
+        for _ in range(30):
+            actions = np.array([venv.action_space.sample() for _ in range(num_envs)])
+            venv.step_async(actions)
+            observations, rewards, dones, _ = venv.step_wait()
+            expected = reference.step(actions)
+            assert np.allclose(observations, expected[0])
+            assert np.array_equal(rewards, expected[1]) and np.array_equal(dones, expected[2])
+        stats = venv.timing_stats()
+        assert (stats['steps'] == 30).all()
+        assert stats['step_time'].shape == (num_envs,)
+    finally:
+        venv.close()
+        reference.close()
+
+
+def test_step_wait_first():
+    num_envs = 4
+    venv = SubprocVecEnv([make_cartpole] * num_envs)
+    try:
+        venv.seed(0)
+        venv.reset()
+        venv.step_async(np.zeros(num_envs, dtype=np.int64))
+        indices, observations, rewards, dones, infos = venv.step_wait_first(2)
+        assert len(indices) == 2 and observations.shape == (2, 4) and len(infos) == 2
+        try:
+            venv.reset()
+        except error.Error:
+            pass
+        else:
+            assert False, 'Should not be able to reset with steps in flight'
+        # the finished workers can be stepped again while the others run
+        venv.step_async(np.zeros(2, dtype=np.int64), indices)
+        seen = []
+        while venv._pending:
+            seen.extend(venv.step_wait_first(1)[0])
+        assert sorted(seen) == list(range(num_envs))
+        assert venv.timing_stats()['steps'].sum() == num_envs + 2
+    finally:
+        venv.close()
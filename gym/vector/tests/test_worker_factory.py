@@ -0,0 +1,28 @@
+import sys
+
+import numpy as np
+
+from gym.vector import SubprocVecEnv
+from gym.vector.tests.helpers import make_cartpole
+from gym.vector.worker_factory import forkserver_context
+
+
+def make_prewarm_probe():
+    # records whether the worker was forked from a server that prewarmed envs
+    env = make_cartpole()
+    env.unwrapped.prewarmed = 'gym.vector.prewarm' in sys.modules
+    return env
+
+
+def test_forkserver_workers_step():
+    ctx = forkserver_context(['gym.envs.classic_control'], ['CartPole-v0'])
+    venv = SubprocVecEnv([make_prewarm_probe] * 2, context=ctx)
+    try:
+        assert venv.call('prewarmed') == [True, True]
+        venv.seed(0)
+        assert venv.reset().shape == (2, 4)
+        _, rewards, _, _ = venv.step(np.zeros(2, dtype=np.int64))
+        assert rewards.shape == (2,)
+    finally:
+        venv.close()
+    assert 'gym.vector.prewarm' not in sys.modules
@@ -0,0 +1,63 @@
+import numpy as np
+
+import gym
+from gym import error
+
+
+class VectorEnv(gym.Env):
+    """Base class for environments that step a batch of `num_envs`
+    sub-environments at once.
+
+    The batch counterparts of the usual API methods are:
+
+        step(actions) -> (observations, rewards, dones, infos)
+        reset() -> observations
+        seed(seeds) -> list of seeds, one per sub-environment
+
+    `observations` is an array of shape (num_envs,) + observation_space.shape,
+    `rewards` and `dones` are arrays of shape (num_envs,), and `infos` is a
+    list holding one info dict per sub-environment. `observation_space` and
+    `action_space` describe a *single* sub-environment.
+
+    Sub-environments are reset automatically when they report done; the last
+    observation of the finished episode is stored in that sub-environment's
+    info dict under 'terminal_observation' and the first observation of the
+    next episode is returned in its place.
+    """
+
+    def __init__(self, num_envs, observation_space, action_space):
+        if num_envs < 1:
+            raise error.Error('A vector env needs at least one sub-environment, got num_envs={}'.format(num_envs))
+        self.num_envs = num_envs
+        self.observation_space = observation_space
+        self.action_space = action_space
+
+    def step(self, actions):
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+    def seed(self, seeds=None):
+        """Seeds every sub-environment.
+
+        Args:
+            seeds (Optional[int or list<int>]): either one seed per
+              sub-environment, or a single integer `s`, in which case
+              sub-environment `i` is seeded with `s + i`.
+        """
+        raise NotImplementedError
+
+    def _seed_list(self, seeds):
+        if seeds is None or isinstance(seeds, (int, np.integer)):
+            return [None if seeds is None else int(seeds) + i for i in range(self.num_envs)]
+        seeds = list(seeds)
+        if len(seeds) != self.num_envs:
+            raise error.Error('Expected {} seeds, got {}'.format(self.num_envs, len(seeds)))
+        return seeds
+
+    def __len__(self):
+        return self.num_envs
+
+    def __str__(self):
+        return '<{}({})>'.format(type(self).__name__, self.num_envs)
@@ -0,0 +1,60 @@
+"""
+Pre-warmed worker processes for vector envs.
+
+Starting a worker with 'spawn' re-imports gym and the simulator (for the
+DART envs: pydart, which is initialized at import, and OpenGL) and parses
+the model files before the first step, which takes seconds per worker.
+`forkserver_context` instead starts one template process, the
+multiprocessing fork server, that does this work once: it imports the
+given modules and builds each given env once, so that import-time state
+and per-process caches (e.g. the DART world builders of
+gym.envs.dart.world_builder) are in place. Workers are forked from it and
+share that state copy-on-write.
+
+Example usage:
+
+    ctx = forkserver_context(['gym.envs.dart'], ['DartWalker3d-v1'])
+    venv = DartVecEnv('DartWalker3d-v1', 64, context=ctx)
+"""
+
+import multiprocessing
+import multiprocessing.forkserver
+
+from gym import logger
+from gym.vector.placement import environ
+
+# read by gym.vector.prewarm in the fork server
+PREWARM_ENV_VAR = 'GYM_PREWARM_ENVS'
+
+# whether forkserver_context has started the fork server of this process
+_started = False
+
+
+def _forkserver_running():
+    # multiprocessing has no public way to ask; if the private pid
+    # attribute goes away, only servers started here are detected
+    server = getattr(multiprocessing.forkserver, '_forkserver', None)
+    return getattr(server, '_forkserver_pid', None) is not None
+
+
+def forkserver_context(modules=('gym',), env_ids=()):
+    """Returns the 'forkserver' multiprocessing context, starting its server
+    after importing `modules` and building (and closing) one env for each
+    of `env_ids` in it.
+
+    There is one fork server per process: if it is already running, it is
+    used as it is and a warning is logged.
+    """
+    global _started
+    ctx = multiprocessing.get_context('forkserver')
+    if _started or _forkserver_running():
+        logger.warn('The fork server is already running; %s and %s are not preloaded', list(modules), list(env_ids))
+        return ctx
+    preload = list(modules)
+    if env_ids:
+        preload.append('gym.vector.prewarm')
+    ctx.set_forkserver_preload(preload)
+    with environ({PREWARM_ENV_VAR: ','.join(env_ids)}):
+        multiprocessing.forkserver.ensure_running()
+    _started = True
+    return ctx
@@ -3,12 +3,15 @@ import os
 import subprocess
 import tempfile
 import os.path
-import distutils.spawn, distutils.version
 import numpy as np
 from six import StringIO
 import six
 from gym import error, logger
 
+# ndarray.tobytes appeared in NumPy 1.9; checked once, rather than comparing
+# version strings with distutils (slow to import) for every frame
+_HAS_TOBYTES = hasattr(np.ndarray, 'tobytes')
+
 def touch(path):
     open(path, 'a').close()
 
@@ -246,6 +249,7 @@ class ImageEncoder(object):
         self.frame_shape = frame_shape
         self.frames_per_sec = frames_per_sec
 
+        import distutils.spawn # takes ~200ms to load, so we import it lazily
         if distutils.spawn.find_executable('avconv') is not None:
             self.backend = 'avconv'
         elif distutils.spawn.find_executable('ffmpeg') is not None:
@@ -297,7 +301,7 @@ class ImageEncoder(object):
         if frame.dtype != np.uint8:
             raise error.InvalidFrame("Your frame has data type {}, but we require uint8 (i.e. RGB values from 0-255).".format(frame.dtype))
 
-        if distutils.version.LooseVersion(np.__version__) >= distutils.version.LooseVersion('1.9.0'):
+        if _HAS_TOBYTES:
             self.proc.stdin.write(frame.tobytes())
         else:
             self.proc.stdin.write(frame.tostring())